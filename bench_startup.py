@@ -0,0 +1,85 @@
+"""Benchmark the time from starting aqctl_newfocus8742 until the first RPC
+is served, in simulation, TCP and USB mode.
+
+Exits with an error if a budget is exceeded.
+"""
+
+import argparse
+import asyncio
+import subprocess
+import sys
+import time
+import threading
+
+from sipyco.pc_rpc import Client
+
+
+def time_to_first_rpc(args, port, timeout=30.):
+    t0 = time.monotonic()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "newfocus8742.aqctl_newfocus8742",
+         "--bind", "127.0.0.1", "--no-localhost-bind", "-p", str(port)]
+        + args)
+    try:
+        while time.monotonic() - t0 < timeout:
+            if proc.poll() is not None:
+                raise ValueError("aqctl exited with {}".format(
+                    proc.returncode))
+            try:
+                client = Client("127.0.0.1", port)
+            except ConnectionError:
+                time.sleep(.001)
+                continue
+            try:
+                assert client.ping()
+            finally:
+                client.close_rpc()
+            return time.monotonic() - t0
+        raise TimeoutError()
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def serve_fleet():
+    from newfocus8742.fleet import Fleet
+    loop = asyncio.new_event_loop()
+    fleet = Fleet(1)
+    port, = loop.run_until_complete(fleet.serve())
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return port
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-p", "--port", type=int, default=13257)
+    parser.add_argument("-n", "--repeat", type=int, default=5)
+    parser.add_argument("--sim-budget", type=float, default=1.,
+                        help="seconds (default: %(default)s)")
+    parser.add_argument("--tcp-budget", type=float, default=1.5,
+                        help="seconds (default: %(default)s)")
+    parser.add_argument("--usb-budget", type=float, default=2.,
+                        help="seconds (default: %(default)s)")
+    parser.add_argument("--usb", action="store_true",
+                        help="also benchmark USB mode (needs a device)")
+    args = parser.parse_args()
+
+    modes = [("sim", ["--simulation"], args.sim_budget),
+             ("tcp", ["--tcp", "127.0.0.1:{}".format(serve_fleet())],
+              args.tcp_budget)]
+    if args.usb:
+        modes.append(("usb", [], args.usb_budget))
+
+    failed = False
+    for name, mode_args, budget in modes:
+        t = min(time_to_first_rpc(mode_args, args.port)
+                for i in range(args.repeat))
+        ok = t <= budget
+        failed |= not ok
+        print("{}: {:.3f} s (budget {:.3f} s) {}".format(
+            name, t, budget, "ok" if ok else "FAILED"))
+    sys.exit(failed)
+
+
+if __name__ == "__main__":
+    main()
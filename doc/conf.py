@@ -34,7 +34,8 @@ class Mock(MagicMock):
 
 
 mock_modules = ["artiq", "artiq.protocols", "artiq.protocols.pc_rpc",
-                "artiq.tools", "usb", "usb.core", "usb.util"]
+                "artiq.tools", "usb", "usb.core", "usb.util", "numpy",
+                "sipyco", "sipyco.pc_rpc"]
 
 for module in mock_modules:
     sys.modules[module] = Mock()
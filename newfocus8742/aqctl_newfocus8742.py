@@ -4,51 +4,252 @@ import argparse
 import os
 import asyncio
 
-from sipyco.pc_rpc import simple_server_loop
 from sipyco import common_args
 
 
 def get_argparser():
     parser = argparse.ArgumentParser()
-    parser.add_argument("--tcp", help="use TCP device, else use first "
-                                      "USB device")
+    parser.add_argument("--tcp", action="append",
+                        help="use TCP device at HOST[:PORT], else use first "
+                             "USB device (repeatable)")
     parser.add_argument("--simulation", action="store_true",
                         help="simulation device")
+    parser.add_argument("--fleet", type=int, metavar="N",
+                        help="simulate N controllers (with --simulation)")
+    parser.add_argument("--timeout", type=float, default=2.,
+                        help="response deadline in seconds "
+                             "(default: %(default)s)")
+    parser.add_argument("--cork", action="store_true",
+                        help="pack commands sent within one event loop "
+                             "iteration into few lines")
+    parser.add_argument("--tune", action="store_true",
+                        help="tune pipelining depth, line length and poll "
+                             "rates to the measured link round trip time "
+                             "and throughput")
+    parser.add_argument("--notify-port", type=int,
+                        help="track move completion with a shared poll "
+                             "loop and broadcast notifications on this "
+                             "port (sipyco broadcast, channel is the "
+                             "target name)")
+    parser.add_argument("--trace-spans", metavar="FILE",
+                        help="export spans of lines sent and queries to "
+                             "FILE (JSON lines)")
+    parser.add_argument("--shm", help="record position telemetry into "
+                                      "a shared memory ring buffer file, "
+                                      "e.g. /dev/shm/newfocus8742")
+    parser.add_argument("--stream-port", type=int,
+                        help="stream position telemetry as binary frames "
+                             "on this port")
+    parser.add_argument("--telemetry-rate", type=float, default=100.,
+                        help="telemetry sample rate for --shm and "
+                             "--stream-port (default: %(default)s)")
+    parser.add_argument("--track", type=float, metavar="INTERVAL",
+                        help="track positions by dead-reckoning and "
+                             "verify them every INTERVAL seconds")
+    parser.add_argument("--journal", help="persist known settings and "
+                                          "offsets in this file and "
+                                          "restore them on startup")
+    parser.add_argument("--shards", type=int, metavar="N",
+                        help="distribute the controllers over N worker "
+                             "processes behind this RPC server")
+    parser.add_argument("--shard-port", type=int,
+                        help="RPC port of the first worker "
+                             "(default: port + 1)")
 
     common_args.simple_network_args(parser, 3257)
     common_args.verbosity_args(parser)
     return parser
 
 
+def _host_port(s):
+    if s.count(":") == 1:
+        host, port = s.split(":")
+        return host, int(port)
+    return s, 23
+
+
+def _worker_argv(args, k, devices):
+    argv = ["--bind", "127.0.0.1", "--no-localhost-bind",
+            "-p", str((args.shard_port or args.port + 1) + k),
+            "--timeout", str(args.timeout)]
+    if args.simulation:
+        argv += ["--simulation", "--fleet", str(len(devices))]
+    else:
+        for tcp in devices:
+            argv += ["--tcp", tcp]
+    if args.cork:
+        argv.append("--cork")
+    if args.tune:
+        argv.append("--tune")
+    if args.track:
+        argv += ["--track", str(args.track)]
+    for opt in "trace_spans", "shm", "journal":
+        if getattr(args, opt):
+            argv += ["--" + opt.replace("_", "-"),
+                     "{}_{}".format(getattr(args, opt), k)]
+    if args.stream_port:
+        argv += ["--stream-port", str(args.stream_port + k)]
+    if args.shm or args.stream_port:
+        argv += ["--telemetry-rate", str(args.telemetry_rate)]
+    argv += ["-v"]*args.verbose + ["-q"]*args.quiet
+    return argv
+
+
+def supervise(args, loop):
+    """Serve the controllers from worker processes."""
+    from sipyco.pc_rpc import simple_server_loop
+    from .shard import Worker, ShardPool, ShardProxy, shard
+
+    if args.simulation:
+        devices = list(range(args.fleet or 1))
+    elif args.tcp:
+        devices = args.tcp
+    else:
+        raise ValueError("only TCP or simulated controllers can be sharded")
+    workers, pools, targets = [], [], {}
+    for k, indices in enumerate(shard(devices, args.shards)):
+        argv = _worker_argv(args, k, [devices[i] for i in indices])
+        workers.append(Worker(argv))
+        for j, i in enumerate(indices):
+            target = ("newfocus8742" if len(indices) == 1
+                      else "newfocus8742_{}".format(j))
+            pool = ShardPool(
+                "127.0.0.1", (args.shard_port or args.port + 1) + k, target)
+            pools.append(pool)
+            targets["newfocus8742_{}".format(i)] = ShardProxy(pool)
+    tasks = [loop.create_task(worker.run()) for worker in workers]
+    try:
+        simple_server_loop(
+            targets,
+            common_args.bind_address_from_args(args),
+            args.port,
+            allow_parallel=True,
+            loop=loop,
+        )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for pool in pools:
+            pool.close()
+        loop.run_until_complete(asyncio.gather(
+            *(worker.stop() for worker in workers)))
+        for task in tasks:
+            task.cancel()
+
+
 def main():
     args = get_argparser().parse_args()
     common_args.init_logger_from_args(args)
 
+    # heavy imports deferred until after argument parsing
+    from sipyco.pc_rpc import simple_server_loop
+    from .controller import Controller, record
+
     if os.name == "nt":
         asyncio.set_event_loop(asyncio.ProactorEventLoop())
     loop = asyncio.get_event_loop()
 
-    if args.simulation:
+    if args.shards:
+        if args.notify_port:
+            raise ValueError("completion notifications are not supported "
+                             "with --shards")
+        return supervise(args, loop)
+
+    if args.simulation and args.fleet:
+        from .fleet import Fleet
+        devs = Fleet(args.fleet).controllers
+    elif args.simulation:
         from .sim import NewFocus8742Sim
-        dev = loop.run_until_complete(NewFocus8742Sim.connect())
+        devs = [loop.run_until_complete(NewFocus8742Sim.connect())]
     elif args.tcp:
         from .tcp import NewFocus8742TCP
-        dev = loop.run_until_complete(NewFocus8742TCP.connect(args.tcp))
+        devs = [loop.run_until_complete(
+                    NewFocus8742TCP.connect(*_host_port(tcp)))
+                for tcp in args.tcp]
     else:
         from .usb import NewFocus8742USB
-        dev = loop.run_until_complete(NewFocus8742USB.connect())
+        devs = [loop.run_until_complete(NewFocus8742USB.connect())]
+
+    if args.journal:
+        from .journal import Journal
+        journal = Journal(args.journal)
+        serials = []
+    if args.shm:
+        from .shm import RingWriter
+    if args.stream_port:
+        from .stream import StreamServer
+        stream = StreamServer()
+        loop.run_until_complete(stream.start(
+            common_args.bind_address_from_args(args), args.stream_port))
+    if args.trace_spans:
+        from .trace import SpanExporter
+        spans = SpanExporter(args.trace_spans)
+
+    if args.notify_port:
+        from sipyco.broadcast import Broadcaster
+        broadcaster = Broadcaster()
+        loop.run_until_complete(broadcaster.start(
+            common_args.bind_address_from_args(args), args.notify_port))
+
+    ctrls = []
+    for i, dev in enumerate(devs):
+        dev.timeout = args.timeout
+        dev.corking = args.cork
+        if args.tune:
+            dev.tune()
+        if args.trace_spans:
+            dev.trace_hooks.append(spans.hook(i))
+        if args.track:
+            loop.run_until_complete(dev.track(args.track).sync())
+
+        ctrl = Controller(dev)
+        ctrls.append(ctrl)
+        if args.journal:
+            serial = loop.run_until_complete(journal.restore(ctrl))
+            serials.append(serial)
+            loop.create_task(journal.run(ctrl, serial))
+
+        sinks = []
+        if args.shm:
+            path = args.shm if len(devs) == 1 else "{}_{}".format(args.shm, i)
+            sinks.append(RingWriter(path))
+        if args.stream_port:
+            sinks.append(stream.sink(i))
+        if sinks:
+            loop.create_task(record(dev, sinks, rate=args.telemetry_rate))
+
+    if len(ctrls) == 1:
+        targets = {"newfocus8742": ctrls[0]}
+    else:
+        targets = {"newfocus8742_{}".format(i): ctrl
+                   for i, ctrl in enumerate(ctrls)}
+
+    if args.notify_port:
+        for name, ctrl in targets.items():
+            ctrl.track_completion(
+                lambda msg, name=name: broadcaster.broadcast(name, msg))
 
     try:
         simple_server_loop(
-            {"newfocus8742": dev},
+            targets,
             common_args.bind_address_from_args(args),
             args.port,
+            allow_parallel=True,
             loop=loop,
         )
     except KeyboardInterrupt:
         pass
     finally:
-        dev.close()
+        if args.notify_port:
+            loop.run_until_complete(broadcaster.stop())
+        if args.stream_port:
+            loop.run_until_complete(stream.stop())
+        for i, ctrl in enumerate(ctrls):
+            if args.journal:
+                journal.save(ctrl, serials[i])
+            ctrl.close()
+        if args.trace_spans:
+            spans.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,249 @@
+import logging
+import asyncio
+import inspect
+import time
+
+logger = logging.getLogger(__name__)
+
+
+async def record(dev, sinks, axes=(1, 2, 3, 4), rate=100.):
+    """Continuously feed positions and motion status into telemetry sinks.
+
+    A single :meth:`NewFocus8742Protocol.watch` loop feeds all sinks.
+    Errors (e.g. response timeouts) are logged and watching is restarted.
+
+    Args:
+        dev (NewFocus8742Protocol): Driver instance.
+        sinks (list): Objects with an `append(timestamp, position, done)`
+            method, e.g. :class:`newfocus8742.shm.RingWriter`.
+        axes (list(int)): Axes to record.
+        rate (float): Maximum sample rate, see
+            :meth:`NewFocus8742Protocol.watch`.
+    """
+    while True:
+        try:
+            async for timestamp, position, done in dev.watch(
+                    axes, rate, until_done=False):
+                for sink in sinks:
+                    sink.append(timestamp, position, done)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.warning("telemetry failed, restarting", exc_info=True)
+            await asyncio.sleep(1.)
+
+
+class Completion:
+    """Shared move completion tracking.
+
+    Axes are armed by move commands (PR, PA, MV) and by waiters. A single
+    poll loop queries the motion status (MD?) and actual position (TP?)
+    of all armed axes in one pipelined exchange. When an axis is done,
+    all its waiters are woken and a notification is published. The
+    device load is independent of the number of waiters.
+
+    Each move command increments the generation of its axis. Motion
+    status replies to polls sent before the latest move command are
+    ignored.
+
+    Args:
+        dev (NewFocus8742Protocol): Driver instance.
+        publish (callable): Called with a `dict(axis=..., position=...,
+            time=...)` notification when a move is done.
+        axes (list(int)): Axes to track.
+    """
+    def __init__(self, dev, publish=None, axes=(1, 2, 3, 4)):
+        self.dev = dev
+        self.publish = publish
+        self.axes = list(axes)
+        self.armed = set()
+        self.waiters = {xx: [] for xx in axes}
+        self.generation = {xx: 0 for xx in axes}
+        self._event = asyncio.Event()
+        dev.observers.append(self)
+
+    def issued(self, cmd, xx=None, *nn):
+        if cmd in ("PR", "PA", "MV") and xx in self.waiters:
+            self.generation[xx] += 1
+            self.armed.add(xx)
+            self._event.set()
+
+    async def wait(self, xx=None):
+        """Wait for an axis (or all axes if `None`) to be done.
+
+        Returns:
+            dict: The completion notification (of the last axis).
+        """
+        if xx is None:
+            ret = await asyncio.gather(*(self.wait(xx) for xx in self.axes))
+            return ret[-1]
+        fut = asyncio.get_event_loop().create_future()
+        self.waiters[xx].append(fut)
+        self.armed.add(xx)
+        self._event.set()
+        return await fut
+
+    async def run(self):
+        """Poll the armed axes."""
+        while True:
+            if not self.armed:
+                self._event.clear()
+                await self._event.wait()
+            axes = sorted(self.armed)
+            # the queries are sent before ask_many() first yields
+            generation = [self.generation[xx] for xx in axes]
+            try:
+                ret = await self.dev.ask_many(
+                    [("MD?", xx) for xx in axes] +
+                    [("TP?", xx) for xx in axes])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("completion poll failed", exc_info=True)
+                for xx in axes:
+                    for fut in self.waiters[xx]:
+                        if not fut.done():
+                            fut.set_exception(e)
+                    self.waiters[xx].clear()
+                    self.armed.discard(xx)
+                continue
+            t = time.time()
+            n = len(axes)
+            for xx, gen, done, position in zip(axes, generation, ret[:n],
+                                               ret[n:]):
+                if not int(done) or gen != self.generation[xx]:
+                    continue
+                msg = {"axis": xx, "position": int(position), "time": t}
+                for fut in self.waiters[xx]:
+                    if not fut.done():
+                        fut.set_result(msg)
+                self.waiters[xx].clear()
+                self.armed.discard(xx)
+                if self.publish is not None:
+                    self.publish(msg)
+            await asyncio.sleep(self.dev.poll_interval)
+
+
+class Controller:
+    """RPC target wrapping a driver instance.
+
+    All public methods of the driver are exposed in addition to the
+    server-side helpers defined here.
+
+    Args:
+        dev (NewFocus8742Protocol): Driver instance.
+    """
+    def __init__(self, dev):
+        self.dev = dev
+        # software position offsets on top of the home position by axis
+        self.offsets = {}
+        self.completion = None
+
+    def track_completion(self, publish=None):
+        """Start shared move completion tracking.
+
+        :meth:`finish` then waits on the shared tracker instead of polling
+        per caller.
+
+        Args:
+            publish (callable): See :class:`Completion`.
+
+        Returns:
+            Completion: Completion tracker.
+        """
+        self.completion = Completion(self.dev, publish)
+        self._completion_task = asyncio.ensure_future(self.completion.run())
+        return self.completion
+
+    async def finish(self, xx=None):
+        """Wait for an axis (or all axes) to finish.
+
+        Returns:
+            dict: The completion notification with final position and
+                timestamp (of the last axis), if completion tracking is
+                enabled.
+        """
+        if self.completion is None:
+            return await self.dev.finish(xx)
+        return await self.completion.wait(xx)
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.dev, name)
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) |
+                      {n for n in dir(self.dev) if not n.startswith("_")})
+
+    def close(self):
+        self.dev.close()
+
+    def set_offset(self, xx, nn=0):
+        """Set the software position offset of an axis.
+
+        The offset is not used by the device or the driver. It is kept
+        (and journaled) for clients that maintain logical positions on
+        top of the home position.
+        """
+        self.offsets[xx] = nn
+
+    def get_offset(self, xx):
+        """Get the software position offset of an axis."""
+        return self.offsets.get(xx, 0)
+
+    async def batch(self, calls):
+        """Execute several driver calls in one RPC round trip.
+
+        The calls are executed in order. Consecutive single queries (e.g.
+        :meth:`NewFocus8742Protocol.get_velocity` or
+        :meth:`NewFocus8742Protocol.ask`) and commands are pipelined to the
+        device: commands are sent right away without waiting for the
+        responses to earlier queries (the device executes lines in order).
+        Other coroutines (e.g. :meth:`NewFocus8742Protocol.finish`) are
+        awaited after all earlier responses and before the next call is
+        executed.
+
+        Args:
+            calls (list): `(method, args)` or `(method, args, kwargs)`
+                tuples.
+
+        Returns:
+            list: One `(ret, err)` tuple per call. `err` is `None` on
+                success and a description of the exception otherwise.
+        """
+        items = []
+        for call in calls:
+            name, args = call[:2]
+            kwargs = call[2] if len(call) > 2 else {}
+            try:
+                if name.startswith("_") or name == "batch":
+                    raise AttributeError("invalid method {}".format(name))
+                method = getattr(self, name)
+                if (getattr(method, "cmd", "").endswith("?")
+                        or name == "ask"):
+                    ret = asyncio.ensure_future(method(*args, **kwargs))
+                    # let it send the query
+                    await asyncio.sleep(0)
+                else:
+                    ret = method(*args, **kwargs)
+                    if inspect.isawaitable(ret):
+                        # coroutines may depend on earlier responses
+                        await self._wait(items)
+                        ret = await ret
+            except Exception as e:
+                logger.debug("batch call %s failed", name, exc_info=True)
+                ret = e
+            items.append(ret)
+        await self._wait(items)
+        return [(None, "{}: {}".format(type(r).__name__, r))
+                if isinstance(r, Exception) else (r, None)
+                for r in items]
+
+    async def _wait(self, items):
+        for i, item in enumerate(items):
+            if isinstance(item, asyncio.Future):
+                try:
+                    items[i] = await item
+                except Exception as e:
+                    items[i] = e
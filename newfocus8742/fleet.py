@@ -0,0 +1,121 @@
+"""Fleet of simulated controllers for load testing.
+
+The per-axis state of all controllers is kept in shared `(n, channels)`
+numpy arrays. Each controller is a :class:`NewFocus8742Sim` operating on
+row views of these arrays. The controllers can be used directly as
+in-process drivers or served as TCP devices on local ports.
+"""
+
+import argparse
+import logging
+import asyncio
+
+import numpy as np
+
+from .sim import NewFocus8742Sim
+
+logger = logging.getLogger(__name__)
+
+
+class Fleet:
+    """Simulated controllers.
+
+    Args:
+        n (int): Number of controllers.
+    """
+    channels = NewFocus8742Sim.channels
+
+    def __init__(self, n):
+        shape = (n, self.channels)
+        self.steps = np.zeros(shape, np.int64)
+        self.home = np.zeros(shape, np.int64)
+        self.target = np.zeros(shape, np.int64)
+        self.velocity = np.full(shape, 2000, np.int64)
+        self.acceleration = np.full(shape, 100000, np.int64)
+        self.controllers = [self._make(i) for i in range(n)]
+        self.servers = []
+
+    def _make(self, i):
+        sim = NewFocus8742Sim()
+        for k in "steps home target velocity acceleration".split():
+            setattr(sim, k, getattr(self, k)[i])
+        return sim
+
+    def __len__(self):
+        return len(self.controllers)
+
+    def __getitem__(self, i):
+        return self.controllers[i]
+
+    async def _handle(self, sim, reader, writer):
+        # mimic the identifier sent by the device on connect
+        writer.write(b"\xff\xfd\x03\xff\xfb\x01")
+        try:
+            while True:
+                line = await reader.readuntil(b"\r")
+                sim._writeline(line[:-1].decode())
+                while sim.pending:
+                    writer.write(sim.pending.pop(0).encode() + b"\r\n")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=0):
+        """Serve each controller as a TCP device.
+
+        Args:
+            host (str): Bind address.
+            port (int): Port of the first controller. The other
+                controllers use consecutive ports. Random ports if 0.
+
+        Returns:
+            list(int): Ports by controller.
+        """
+        ports = []
+        for i, sim in enumerate(self.controllers):
+            server = await asyncio.start_server(
+                lambda r, w, sim=sim: self._handle(sim, r, w),
+                host, port + i if port else 0)
+            self.servers.append(server)
+            ports.append(server.sockets[0].getsockname()[1])
+        return ports
+
+    def close(self):
+        for server in self.servers:
+            server.close()
+        self.servers.clear()
+
+
+def get_argparser():
+    parser = argparse.ArgumentParser(
+        description="Serve simulated controllers as TCP devices")
+    parser.add_argument("-n", "--controllers", type=int, default=8,
+                        help="number of controllers (default: %(default)s)")
+    parser.add_argument("--bind", default="127.0.0.1",
+                        help="bind address (default: %(default)s)")
+    parser.add_argument("-p", "--port", type=int, default=18742,
+                        help="port of the first controller "
+                             "(default: %(default)s)")
+    return parser
+
+
+def main():
+    args = get_argparser().parse_args()
+    logging.basicConfig(level=logging.INFO)
+    loop = asyncio.get_event_loop()
+    fleet = Fleet(args.controllers)
+    ports = loop.run_until_complete(fleet.serve(args.bind, args.port))
+    logger.info("serving %s controllers on ports %s-%s",
+                len(fleet), ports[0], ports[-1])
+    try:
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        fleet.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import asyncio
+
+from .protocol import Move
+
+
+class ControllerGroup:
+    """Several New Focus/Newport 8742 controllers operated together.
+
+    The controllers may use any mix of transports.
+
+    Args:
+        devs (list(NewFocus8742Protocol)): Driver instances. Controllers
+            are addressed by their index in this list.
+        axes (list(int)): Axes affected by the fan-out operations.
+
+    Fan-out operations run concurrently across controllers and are
+    pipelined within each controller. Their results are lists in the order
+    of the controllers.
+    """
+    def __init__(self, devs, axes=(1, 2, 3, 4)):
+        self.devs = list(devs)
+        self.axes = list(axes)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for dev in self.devs:
+            dev.close()
+
+    def move_many(self, targets, relative=False):
+        """Start a coordinated move of axes across controllers.
+
+        The commands for each controller are packed into as few lines as
+        possible, see :meth:`NewFocus8742Protocol.move_many`.
+
+        Args:
+            targets (dict): Mapping from `(controller, axis)` to target
+                position (or distance if `relative`).
+            relative (bool): Relative (PR) instead of absolute (PA) move.
+
+        Returns:
+            Move: Handle to wait for or cancel the move on all
+                controllers.
+        """
+        by_dev = {}
+        for (i, xx), n in targets.items():
+            by_dev.setdefault(i, {})[xx] = n
+        axes = {}
+        for i, t in by_dev.items():
+            axes.update(self.devs[i].move_many(t, relative).axes)
+        return Move(axes)
+
+    def stop_all(self):
+        """Stop (ST) all axes with deceleration."""
+        for dev in self.devs:
+            dev.do_many(("ST", xx) for xx in self.axes)
+
+    def abort_all(self):
+        """Abort (AB) motion on all controllers."""
+        for dev in self.devs:
+            dev.abort()
+
+    def set_home_all(self, nn=0):
+        """Set the home position (DH) of all axes."""
+        for dev in self.devs:
+            dev.do_many(("DH", xx, nn) for xx in self.axes)
+
+    async def ask(self, cmd, xx=None, *nn):
+        """Execute a query on all controllers.
+
+        See Also:
+            :meth:`NewFocus8742Protocol.ask`
+        """
+        return await asyncio.gather(*(dev.ask(cmd, xx, *nn)
+                                      for dev in self.devs))
+
+    async def finish_all(self):
+        """Wait for all axes on all controllers to finish."""
+        await asyncio.gather(*(dev.finish_many(self.axes)
+                               for dev in self.devs))
+
+    async def _snapshot(self, dev):
+        cmds = ("TP?", "MD?", "VA?", "AC?")
+        ret = await dev.ask_many((cmd, xx) for cmd in cmds
+                                 for xx in self.axes)
+        ret = [int(r) for r in ret]
+        n = len(self.axes)
+        return {"position": ret[:n], "done": [bool(r) for r in ret[n:2*n]],
+                "velocity": ret[2*n:3*n], "acceleration": ret[3*n:]}
+
+    async def snapshot_all(self):
+        """Get the state of all axes on all controllers.
+
+        Returns:
+            list(dict): Per controller, lists of actual positions (TP?),
+                motion done flags (MD?), velocities (VA?) and accelerations
+                (AC?) of all axes.
+        """
+        return await asyncio.gather(*(self._snapshot(dev)
+                                      for dev in self.devs))
@@ -0,0 +1,144 @@
+"""Persistent journal of controller state for warm restarts.
+
+The journal is an append-only file of JSON lines. Each line records a
+change of a known setting or software offset of a controller, identified
+by its serial number. The file is periodically compacted to contain one
+line per known value.
+"""
+
+import logging
+import asyncio
+import json
+import os
+
+from .protocol import parse_identity
+
+logger = logging.getLogger(__name__)
+
+
+class Journal:
+    """Controller state journal.
+
+    Args:
+        path (str): Journal file. Created if it does not exist.
+        compact (int): Compact the journal when it contains more than this
+            many times the number of known values in lines.
+    """
+    def __init__(self, path, compact=4):
+        self.path = path
+        self.compact_factor = compact
+        # state[serial][(kind, cmd, xx)] = value
+        self.state = {}
+        self.lines = 0
+        try:
+            with open(path) as f:
+                for line in f:
+                    try:
+                        self._apply(json.loads(line))
+                    except (ValueError, KeyError, TypeError):
+                        # e.g. partially written by a crash
+                        logger.warning("skipping corrupt journal line %r",
+                                       line)
+                        continue
+                    self.lines += 1
+        except FileNotFoundError:
+            pass
+        self.compact()
+
+    def _apply(self, entry):
+        state = self.state.setdefault(entry["serial"], {})
+        key = (entry["kind"], entry["cmd"], entry["xx"])
+        if entry["value"] is None:
+            state.pop(key, None)
+        else:
+            state[key] = entry["value"]
+
+    def _entries(self, serial, changes):
+        for (kind, cmd, xx), value in changes.items():
+            yield {"serial": serial, "kind": kind, "cmd": cmd, "xx": xx,
+                   "value": value}
+
+    def compact(self):
+        """Rewrite the journal with one line per known value."""
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            self.lines = 0
+            for serial, state in self.state.items():
+                for entry in self._entries(serial, state):
+                    f.write(json.dumps(entry) + "\n")
+                    self.lines += 1
+        os.replace(tmp, self.path)
+
+    def update(self, serial, state):
+        """Append the changes between the journaled and the given state.
+
+        Args:
+            serial (str): Controller serial number.
+            state (dict): Mapping from `(kind, cmd, xx)` to value.
+        """
+        old = self.state.get(serial, {})
+        changes = {k: v for k, v in state.items() if old.get(k) != v}
+        changes.update((k, None) for k in old if k not in state)
+        if not changes:
+            return
+        with open(self.path, "a") as f:
+            for entry in self._entries(serial, changes):
+                f.write(json.dumps(entry) + "\n")
+                self._apply(entry)
+                self.lines += 1
+            f.flush()
+            os.fsync(f.fileno())
+        n = sum(len(state) for state in self.state.values())
+        if self.lines > self.compact_factor*max(n, 1):
+            self.compact()
+
+    def save(self, ctrl, serial):
+        """Journal the current state of a controller.
+
+        Args:
+            ctrl (Controller): RPC target wrapping the driver.
+            serial (str): Controller serial number, see :meth:`restore`.
+        """
+        state = {("setting", cmd, xx): v
+                 for (cmd, xx), v in ctrl.dev.settings.items()}
+        state.update((("offset", "", xx), v)
+                     for xx, v in ctrl.offsets.items())
+        self.update(serial, state)
+
+    async def restore(self, ctrl):
+        """Restore the state of a controller and verify it.
+
+        The journaled settings are verified against the device in one
+        pipelined exchange and then answered from the driver's cache.
+
+        Args:
+            ctrl (Controller): RPC target wrapping the driver.
+
+        Returns:
+            str: Controller serial number.
+        """
+        sn = parse_identity(await ctrl.dev.identify())["serial"]
+        state = self.state.get(sn, {})
+        settings = {(cmd, xx): v for (kind, cmd, xx), v in state.items()
+                    if kind == "setting"}
+        mismatch = await ctrl.dev.warm(settings)
+        if mismatch:
+            logger.warning("settings changed since last run: %s", mismatch)
+        ctrl.offsets.update((xx, v) for (kind, cmd, xx), v in state.items()
+                            if kind == "offset")
+        ctrl.dev.use_cache = True
+        logger.info("restored %s settings and %s offsets for %s",
+                    len(settings), len(ctrl.offsets), sn)
+        return sn
+
+    async def run(self, ctrl, serial, interval=1.):
+        """Periodically journal the state of a controller.
+
+        Args:
+            ctrl (Controller): RPC target wrapping the driver.
+            serial (str): Controller serial number, see :meth:`restore`.
+            interval (float): Journal interval in seconds.
+        """
+        while True:
+            self.save(ctrl, serial)
+            await asyncio.sleep(interval)
@@ -0,0 +1,116 @@
+"""Adaptive link tuning.
+
+Estimates round trip time and throughput of a connection passively from
+the timing of queries and derives the pipelining depth, the line length
+for packed commands and the status poll and telemetry rates from them.
+"""
+
+import math
+
+
+class LinkTuner:
+    """Passive link estimator and tuner.
+
+    Round trip time (RTT) samples are taken from queries sent while no
+    other query was outstanding. Service time samples (the time between
+    consecutive responses) are taken from pipelined queries. Both are
+    smoothed like TCP's RTT estimator.
+
+    Args:
+        min_poll (float): Minimum status poll interval in seconds.
+        max_poll (float): Maximum status poll interval in seconds.
+        max_depth (int): Maximum number of queries in flight.
+        max_telemetry (float): Maximum telemetry rate in Hz.
+    """
+    alpha = 1/8
+    beta = 1/4
+
+    def __init__(self, min_poll=.002, max_poll=.5, max_depth=32,
+                 max_telemetry=1000.):
+        self.min_poll = min_poll
+        self.max_poll = max_poll
+        self.max_depth = max_depth
+        self.max_telemetry = max_telemetry
+        self.rtt = None
+        self.rttvar = None
+        self.service = None
+        self.samples = 0
+        self.timeouts = 0
+        self.line_length = 64
+
+    def sample(self, sent, received, previous=None):
+        """Add a timing sample of a query.
+
+        Args:
+            sent (float): Time the query was sent.
+            received (float): Time the response was received.
+            previous (float): Time the previous response was received if
+                the query was pipelined behind other queries, else `None`.
+        """
+        self.samples += 1
+        if previous is None:
+            r = received - sent
+            if self.rtt is None:
+                self.rtt, self.rttvar = r, r/2
+            else:
+                self.rttvar += self.beta*(abs(self.rtt - r) - self.rttvar)
+                self.rtt += self.alpha*(r - self.rtt)
+        else:
+            s = received - max(sent, previous)
+            if self.service is None:
+                self.service = s
+            else:
+                self.service += self.alpha*(s - self.service)
+        # recover line length after timeouts
+        self.line_length = min(64, self.line_length + 1)
+
+    def timeout(self):
+        """Register a response timeout.
+
+        Lost responses shrink the packed line length to reduce the impact
+        of lost transfers.
+        """
+        self.timeouts += 1
+        self.line_length = max(16, self.line_length//2)
+
+    @property
+    def depth(self):
+        """Number of queries in flight: the bandwidth-delay product."""
+        if self.rtt is None or not self.service:
+            return self.max_depth
+        return max(1, min(self.max_depth,
+                          math.ceil(self.rtt/self.service)))
+
+    @property
+    def poll_interval(self):
+        """Status poll interval: twice the round trip time."""
+        if self.rtt is None:
+            return None
+        return min(self.max_poll, max(self.min_poll,
+                                      2*(self.rtt + self.rttvar)))
+
+    def telemetry_rate(self, queries):
+        """Maximum sustainable telemetry rate.
+
+        Args:
+            queries (int): Number of pipelined queries per sample.
+        """
+        if self.rtt is None:
+            return self.max_telemetry
+        t = self.rtt + (queries - 1)*(self.service or self.rtt)
+        return min(self.max_telemetry, 1/max(t, 1e-6))
+
+    def info(self):
+        """Current estimates and decisions."""
+        return {
+            "rtt": self.rtt,
+            "rttvar": self.rttvar,
+            "service": self.service,
+            "throughput": 1/self.service if self.service else None,
+            "samples": self.samples,
+            "timeouts": self.timeouts,
+            "depth": self.depth,
+            "line_length": self.line_length,
+            "poll_interval": self.poll_interval,
+            "telemetry_rate": self.telemetry_rate(8),
+        }
@@ -0,0 +1,116 @@
+"""Load generator for the aqctl_newfocus8742 RPC server.
+
+Opens many sipyco RPC clients, drives a mixed read/move workload against
+the served controllers and reports throughput and latency percentiles.
+"""
+
+import argparse
+import logging
+import asyncio
+import random
+import time
+
+from sipyco.pc_rpc import AsyncioClient
+
+logger = logging.getLogger(__name__)
+
+
+def percentile(data, p):
+    """Percentile `p` (0-100) of sorted data."""
+    if not data:
+        return float("nan")
+    return data[min(len(data) - 1, int(len(data)*p/100))]
+
+
+async def _client(host, port, target, deadline, moves, latencies, errors):
+    client = AsyncioClient()
+    await client.connect_rpc(host, port, target)
+    try:
+        while time.monotonic() < deadline:
+            xx = random.randint(1, 4)
+            t0 = time.monotonic()
+            try:
+                if random.random() < moves:
+                    await client.set_relative(xx, random.randint(-100, 100))
+                else:
+                    await client.position(xx)
+            except Exception:
+                logger.debug("call failed", exc_info=True)
+                errors.append(time.monotonic() - t0)
+            else:
+                latencies.append(time.monotonic() - t0)
+    finally:
+        client.close_rpc()
+
+
+async def run(host, port, targets, clients, duration, moves=.1):
+    """Run the load test.
+
+    Args:
+        host (str): RPC server host.
+        port (int): RPC server port.
+        targets (list(str)): Target names, distributed over the clients.
+        clients (int): Number of RPC clients.
+        duration (float): Duration in seconds.
+        moves (float): Fraction of calls that are moves (PR), the others
+            are position queries (TP?).
+
+    Returns:
+        dict: Number of calls and errors, throughput in calls/s and
+            latency percentiles in seconds.
+    """
+    latencies, errors = [], []
+    deadline = time.monotonic() + duration
+    t0 = time.monotonic()
+    await asyncio.gather(*(
+        _client(host, port, targets[i % len(targets)], deadline, moves,
+                latencies, errors)
+        for i in range(clients)))
+    t = time.monotonic() - t0
+    latencies.sort()
+    ret = {"calls": len(latencies), "errors": len(errors),
+           "throughput": len(latencies)/t}
+    for p in 50, 90, 99, 99.9:
+        ret["p{}".format(p)] = percentile(latencies, p)
+    return ret
+
+
+def get_argparser():
+    parser = argparse.ArgumentParser(
+        description="Load test an aqctl_newfocus8742 server")
+    parser.add_argument("-s", "--server", default="::1",
+                        help="hostname or IP of the server "
+                             "(default: %(default)s)")
+    parser.add_argument("-p", "--port", type=int, default=3257,
+                        help="TCP port (default: %(default)s)")
+    parser.add_argument("-t", "--target", action="append",
+                        help="target name (repeatable, default: all)")
+    parser.add_argument("-c", "--clients", type=int, default=100,
+                        help="number of RPC clients (default: %(default)s)")
+    parser.add_argument("-d", "--duration", type=float, default=10.,
+                        help="duration in seconds (default: %(default)s)")
+    parser.add_argument("-m", "--moves", type=float, default=.1,
+                        help="fraction of move calls (default: %(default)s)")
+    return parser
+
+
+def main():
+    args = get_argparser().parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    loop = asyncio.get_event_loop()
+    targets = args.target
+    if not targets:
+        client = AsyncioClient()
+        loop.run_until_complete(
+            client.connect_rpc(args.server, args.port, None))
+        targets, _ = client.get_rpc_id()
+        client.close_rpc()
+    ret = loop.run_until_complete(run(
+        args.server, args.port, targets, args.clients, args.duration,
+        args.moves))
+    for k, v in ret.items():
+        print("{}: {:g}".format(k, v))
+
+
+if __name__ == "__main__":
+    main()
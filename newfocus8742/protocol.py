@@ -1,5 +1,7 @@
 import logging
 import asyncio
+import collections
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -7,22 +9,231 @@ logger = logging.getLogger(__name__)
 def _make_do(cmd, doc=None):
     def f(self, xx=None, *nn):
         self.do(cmd, xx, *nn)
+    f.cmd = cmd
     if doc is not None:
         f.__doc__ = doc
     return f
 
 
-def _make_ask(cmd, doc=None, conv=int):
+def _make_ask(cmd, doc=None, conv=int, cache=False):
     assert cmd.endswith("?")
-    async def f(self, xx=None, *nn):
-        ret = await self.ask(cmd, xx, *nn)
+    key = cmd[:-1]
+    async def f(self, xx=None, *nn, timeout=None):
+        if cache and self.use_cache and (key, xx) in self.settings:
+            return self.settings[(key, xx)]
+        ret = await self.ask(cmd, xx, *nn, timeout=timeout)
         ret = conv(ret)
+        if cache:
+            self.settings[(key, xx)] = ret
         return ret
+    f.cmd = cmd
     if doc is not None:
         f.__doc__ = doc
     return f
 
 
+def _make_ask_all(cmd, dtype, doc=None):
+    assert cmd.endswith("?")
+    async def f(self, axes=(1, 2, 3, 4), timeout=None):
+        import numpy as np
+        ret = await self.ask_many(((cmd, xx) for xx in axes), timeout)
+        return np.array(ret, np.int32).astype(dtype, copy=False)
+    f.cmd = cmd
+    if doc is not None:
+        f.__doc__ = doc
+    return f
+
+
+def parse_error(ret):
+    """Parse an error response (TB?).
+
+    Returns:
+        tuple(int, str): Error code and message.
+    """
+    code, message = ret.split(",", 1)
+    return int(code), message.strip()
+
+
+def parse_identity(ret):
+    r"""Parse an identification response (\*IDN?).
+
+    Returns:
+        dict: Company, model, firmware version, firmware date and serial
+            number.
+    """
+    keys = "company model version date serial".split()
+    return dict(zip(keys, ret.split()))
+
+
+class Move:
+    """Handle to a coordinated move of several axes.
+
+    Await the handle to wait for all axes to finish. :meth:`cancel` stops
+    all axes involved.
+
+    Args:
+        axes (dict): Mapping from driver instances to the list of axes
+            moved on each of them.
+    """
+    def __init__(self, axes):
+        self.axes = axes
+
+    async def wait(self):
+        """Wait for all axes to finish."""
+        await asyncio.gather(*(dev.finish_many(axes)
+                               for dev, axes in self.axes.items()))
+
+    def __await__(self):
+        return self.wait().__await__()
+
+    def cancel(self, abort=False):
+        """Stop all axes involved.
+
+        Args:
+            abort (bool): Abort (AB) motion abruptly instead of stopping
+                (ST) with deceleration. Abort affects all axes of a
+                controller.
+        """
+        for dev, axes in self.axes.items():
+            if abort:
+                dev.abort()
+            else:
+                dev.do_many(("ST", xx) for xx in axes)
+
+
+class Setpoint:
+    """Latest-wins setpoint channel for one axis.
+
+    New targets replace older ones that have not been sent yet (relative
+    targets are accumulated). The latest target is sent once the
+    previous move is done. This keeps the control latency bounded for
+    high rate input and avoids "MOTION IN PROGRESS" errors.
+
+    In `jog` mode, targets are directions of indefinite motion (MV):
+    positive, negative or zero to stop. On a change of direction the axis
+    is stopped (ST) and restarted in the new direction once it is done.
+
+    Errors (e.g. timeouts) are logged and sending is retried.
+
+    Args:
+        dev (NewFocus8742Protocol): Driver instance.
+        xx (int): Axis.
+        relative (bool): Relative (PR) instead of absolute (PA) targets.
+        jog (bool): Directions of indefinite motion (MV) instead of
+            targets.
+    """
+    def __init__(self, dev, xx, relative=False, jog=False):
+        self.dev = dev
+        self.xx = xx
+        self.relative = relative
+        self.jog = jog
+        self.pending = None
+        self.sent = 0
+        self.coalesced = 0
+        self.errors = 0
+        self._direction = 0
+        self._event = asyncio.Event()
+        self._task = asyncio.ensure_future(self._run())
+
+    def put(self, target):
+        """Update the target."""
+        if self.pending is not None:
+            self.coalesced += 1
+            if self.relative:
+                target += self.pending
+        self.pending = target
+        self._event.set()
+
+    def stats(self):
+        """Return the number of targets sent and coalesced and the number
+        of errors."""
+        return {"sent": self.sent, "coalesced": self.coalesced,
+                "errors": self.errors}
+
+    def close(self):
+        """Stop sending targets. Pending targets are discarded, jogging
+        is stopped."""
+        self._task.cancel()
+        if self._direction:
+            self.dev.stop(self.xx)
+            self._direction = 0
+
+    async def _run(self):
+        while True:
+            await self._event.wait()
+            try:
+                if self.jog:
+                    await self._send_jog()
+                else:
+                    await self._send()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.errors += 1
+                logger.warning("setpoint for axis %s failed, retrying",
+                               self.xx, exc_info=True)
+                await asyncio.sleep(self.dev.poll_interval)
+
+    async def _send(self):
+        await self.dev.finish(self.xx)
+        self._event.clear()
+        target, self.pending = self.pending, None
+        self.dev.do("PR" if self.relative else "PA", self.xx, target)
+        self.sent += 1
+
+    async def _send_jog(self):
+        if self._direction and _sign(self.pending) != self._direction:
+            self.dev.stop(self.xx)
+            self._direction = 0
+        if not self._direction:
+            await self.dev.finish(self.xx)
+        self._event.clear()
+        direction, self.pending = _sign(self.pending), None
+        if direction != self._direction:
+            self.dev.move(self.xx, "+" if direction > 0 else "-")
+            self._direction = direction
+            self.sent += 1
+
+
+def _sign(n):
+    return (n > 0) - (n < 0)
+
+
+_get_task = getattr(asyncio, "current_task", None) or asyncio.Task.current_task
+
+
+def _current_task():
+    try:
+        return _get_task()
+    except RuntimeError:  # no running loop
+        return None
+
+
+class _Batch:
+    def __init__(self, dev):
+        self.dev = dev
+
+    def __enter__(self):
+        # [nesting depth, corked commands] of the current task
+        self.dev._batches.setdefault(_current_task(), [0, []])[0] += 1
+
+    def __exit__(self, *exc):
+        task = _current_task()
+        batch = self.dev._batches[task]
+        batch[0] -= 1
+        if not batch[0]:
+            del self.dev._batches[task]
+            cmds, self.dev._cork = self.dev._cork + batch[1], []
+            if cmds:
+                self.dev._write(cmds)
+
+    async def __aenter__(self):
+        self.__enter__()
+
+    async def __aexit__(self, *exc):
+        self.__exit__(*exc)
+
+
 class NewFocus8742Protocol:
     """New Focus/Newport 8742 Driver.
 
@@ -30,6 +241,50 @@ class NewFocus8742Protocol:
     https://www.newport.com/p/8742
     """
     poll_interval = .01
+    # answer setting queries (acceleration, home, velocity) from known
+    # `settings` without querying the device
+    use_cache = False
+    # dead-reckoning position tracker, see `track()`
+    tracker = None
+    # default deadline for responses in seconds (None: wait forever)
+    timeout = 2.
+    # query and expected response substring used to resynchronize
+    sentinel = ("VE?", "8742")
+    # time in seconds without input after which stale input is considered
+    # drained when resynchronizing
+    quiet = .1
+    # cork commands sent within one event loop iteration and send them
+    # packed into few lines, see also `batch()`
+    corking = False
+    # commands that are never corked
+    _urgent = ("AB", "ST")
+    # maximum line length (exclusive)
+    line_length = 64
+    # maximum number of queries in flight in `ask_many()`
+    depth = None
+    # adaptive link tuner, see `tune()`
+    link = None
+
+    def __init__(self):
+        # (future, query, time sent, pipelined) for responses to queries
+        # that have been sent, in order
+        self._responses = collections.deque()
+        self._received = None
+        self._read_lock = asyncio.Lock()
+        # known settings by (cmd, xx)
+        self.settings = {}
+        self.stats = collections.Counter()
+        self._desynced = False
+        self._cork = []
+        self._batches = {}
+        # objects notified of each command sent through their
+        # `issued(cmd, xx, *nn)` method
+        self.observers = []
+        # trace hooks, see `newfocus8742.trace.TraceHook`
+        self.trace_hooks = []
+        if logger.isEnabledFor(logging.DEBUG):
+            from .trace import LogTrace
+            self.trace_hooks.append(LogTrace(logger))
 
     def fmt_cmd(self, cmd, xx=None, *nn):
         """Format a command.
@@ -37,12 +292,14 @@ class NewFocus8742Protocol:
         Args:
             cmd (str): few-letter command
             xx (int, optional for some commands): Motor channel
-            nn (multiple int, optional): additional parameters
+            nn (multiple int, optional): additional parameters, or "+" or
+                "-" for the direction of indefinite moves (MV)
         """
         if xx is not None:
             cmd = "{:d}".format(xx) + cmd
         if nn:
-            cmd += ", ".join("{:d}".format(n) for n in nn)
+            cmd += ", ".join(n if n in ("+", "-") else "{:d}".format(n)
+                             for n in nn)
         return cmd
 
     def do(self, cmd, xx=None, *nn):
@@ -52,30 +309,367 @@ class NewFocus8742Protocol:
             :meth:`fmt_cmd`: for the formatting and additional
                 parameters.
         """
-        cmd = self.fmt_cmd(cmd, xx, *nn)
-        assert len(cmd) < 64
-        logger.debug("do %s", cmd)
-        self._writeline(cmd)
+        self._send([self.fmt_cmd(cmd, xx, *nn)], cmd in self._urgent)
+        self._issued(cmd, xx, *nn)
+
+    def _pack(self, cmds):
+        lines = []
+        n = self.line_length
+        for cmd in cmds:
+            assert len(cmd) < 64
+            if lines and len(lines[-1]) + 1 + len(cmd) < n:
+                lines[-1] += ";" + cmd
+            else:
+                lines.append(cmd)
+        return lines
+
+    def fmt_lines(self, cmds):
+        """Pack several commands into as few lines as possible.
+
+        Commands are separated by semicolons and each line is kept
+        shorter than :attr:`line_length` (64) characters.
+
+        Args:
+            cmds (iterable of tuple): `(cmd, xx, *nn)` tuples, see
+                :meth:`fmt_cmd`
+
+        Returns:
+            list(str): Lines
+        """
+        return self._pack([self.fmt_cmd(*cmd) for cmd in cmds])
+
+    def do_many(self, cmds):
+        """Format and send several commands packed into few lines.
+
+        See Also:
+            :meth:`fmt_lines`: for the packing.
+        """
+        cmds = list(cmds)
+        self._send([self.fmt_cmd(*cmd) for cmd in cmds],
+                   any(cmd[0] in self._urgent for cmd in cmds))
+        for cmd in cmds:
+            self._issued(*cmd)
+
+    def _send(self, cmds, urgent=False):
+        # send formatted commands or cork them
+        if urgent:
+            self.uncork()
+            self._write(cmds)
+            return
+        if self._batches:
+            batch = self._batches.get(_current_task())
+            if batch is not None:
+                batch[1].extend(cmds)
+                return
+        if self.corking:
+            if not self._cork:
+                asyncio.get_event_loop().call_soon(self._uncork)
+            self._cork.extend(cmds)
+        else:
+            self._write(cmds)
+
+    def _write(self, cmds):
+        lines = self._pack(cmds)
+        self.stats["transfers_saved"] += len(cmds) - len(lines)
+        hooks = self.trace_hooks
+        for line in lines:
+            if hooks:
+                t = time.monotonic()
+                for hook in hooks:
+                    hook.pre_send(t, line)
+            self._writeline(line)
+            if hooks:
+                t = time.monotonic()
+                for hook in hooks:
+                    hook.post_send(t, line)
+
+    def uncork(self):
+        """Send all commands corked automatically and those corked in a
+        :meth:`batch` block of the current task."""
+        cmds, self._cork = self._cork, []
+        if self._batches:
+            batch = self._batches.get(_current_task())
+            if batch is not None:
+                cmds += batch[1]
+                batch[1] = []
+        if cmds:
+            self._write(cmds)
+
+    def _uncork(self):
+        # scheduled automatic uncork, outside of any task
+        cmds, self._cork = self._cork, []
+        if cmds:
+            self._write(cmds)
+
+    def batch(self):
+        """Cork commands sent within a block.
+
+        Commands are sent packed into as few lines as possible when the
+        block is left or when a query is sent::
+
+            async with dev.batch():
+                dev.set_velocity(1, 1000)
+                dev.set_acceleration(1, 10000)
+                dev.set_relative(1, 100)
+
+        Only commands sent by the current task are corked, other tasks
+        are not held back. Stop (ST) and abort (AB) are never corked: they
+        are sent right away, after the commands corked so far. Awaiting
+        within a block only delays the commands of the block.
 
-    async def ask(self, cmd, xx=None, *nn):
+        See Also:
+            :attr:`corking`
+        """
+        return _Batch(self)
+
+    def _issued(self, cmd, xx=None, *nn):
+        # track the effect of a command sent
+        if cmd in ("AC", "DH", "QM", "VA"):
+            self.settings[(cmd, xx)] = nn[0] if nn else 0
+        elif cmd in ("*RCL", "*RST", "MC"):
+            self.settings.clear()
+        elif cmd in ("PA", "PR", "MV"):
+            # auto motor detection may update the motor type during moves
+            self.settings.pop(("QM", xx), None)
+        for observer in self.observers:
+            observer.issued(cmd, xx, *nn)
+
+    def _query(self, cmd, xx=None, *nn):
+        # send a query and return the future for its response
+        assert cmd.endswith("?")
+        self.uncork()
+        line = self.fmt_cmd(cmd, xx, *nn)
+        self._write([line])
+        fut = asyncio.get_event_loop().create_future()
+        t = None if self.link is None else time.monotonic()
+        self._responses.append((fut, line, t, bool(self._responses)))
+        return fut
+
+    def _deadline(self, timeout):
+        if timeout is None:
+            timeout = self.timeout
+        if timeout is None:
+            return None
+        return asyncio.get_event_loop().time() + timeout
+
+    @staticmethod
+    def _remaining(deadline):
+        if deadline is None:
+            return None
+        return max(0., deadline - asyncio.get_event_loop().time())
+
+    async def _receive(self, fut, deadline=None):
+        # read and dispatch responses in order until `fut` is resolved
+        async with self._read_lock:
+            if self._desynced:
+                await self._resync()
+            while not fut.done():
+                try:
+                    ret = await self._readline(self._remaining(deadline))
+                except asyncio.TimeoutError:
+                    self.stats["timeouts"] += 1
+                    if self.link is not None:
+                        self.link.timeout()
+                        self._tune()
+                    logger.warning("response timed out")
+                    self._desynced = True
+                    await self._resync()
+                    raise
+                f, line, sent, pipelined = self._responses.popleft()
+                if sent is not None and self.link is not None:
+                    t = time.monotonic()
+                    self.link.sample(sent, t, self._received
+                                     if pipelined else None)
+                    self._received = t
+                    self._tune()
+                if self.trace_hooks:
+                    t = time.monotonic()
+                    for hook in self.trace_hooks:
+                        hook.response(t, line, ret)
+                if not f.done():
+                    f.set_result(ret)
+        return fut.result()
+
+    async def resync(self):
+        """Resynchronize the response stream.
+
+        Outstanding queries fail and stale input is drained until the link
+        is :attr:`quiet`. Then a sentinel query is sent and responses are
+        discarded until the response to the sentinel is received. Since a
+        late response to an earlier query may look like the sentinel
+        response, input is drained again afterwards. Queries sent during
+        resynchronization fail as well.
+        """
+        async with self._read_lock:
+            await self._resync()
+
+    async def _resync(self):
+        # with `_read_lock` held
+        self.stats["resyncs"] += 1
+        self._fail_pending()
+        await self._drain()
+        cmd, expect = self.sentinel
+        self.uncork()
+        self._write([cmd])
+        deadline = self._deadline(None)
+        try:
+            while True:
+                ret = await self._readline(self._remaining(deadline))
+                if expect in ret:
+                    break
+                self._stale(ret)
+        except asyncio.TimeoutError:
+            self._dropped(cmd)
+            raise
+        if self.trace_hooks:
+            t = time.monotonic()
+            for hook in self.trace_hooks:
+                hook.response(t, cmd, ret)
+        await self._drain()
+        self._fail_pending()
+        self._desynced = False
+        logger.info("resynchronized")
+
+    def _fail_pending(self):
+        err = asyncio.TimeoutError("response lost, stream resynchronized")
+        while self._responses:
+            f, line = self._responses.popleft()[:2]
+            self._dropped(line)
+            if not f.done():
+                f.set_exception(err)
+                # the owner may be gone, do not warn about retrieval
+                f.exception()
+
+    def _dropped(self, line):
+        # the response to a query sent will not be dispatched
+        if self.trace_hooks:
+            t = time.monotonic()
+            for hook in self.trace_hooks:
+                hook.dropped(t, line)
+
+    async def _drain(self):
+        # discard input until the link is quiet
+        self.flush()
+        while True:
+            try:
+                ret = await self._readline(self.quiet)
+            except asyncio.TimeoutError:
+                break
+            self._stale(ret)
+
+    def _stale(self, ret):
+        self.stats["stale"] += 1
+        logger.debug("stale response %s", ret)
+
+    def get_stats(self):
+        """Get link statistics.
+
+        Returns:
+            dict: Counts of response timeouts, resynchronizations and
+                stale responses discarded.
+        """
+        return dict(self.stats)
+
+    async def ask(self, cmd, xx=None, *nn, timeout=None):
         """Execute a command and return a response.
 
         The command needs to include the final question mark.
+        Concurrent queries are pipelined: they are sent immediately and
+        the responses are dispatched in order.
+
+        If the response does not arrive within the deadline,
+        `asyncio.TimeoutError` is raised and the response stream is
+        resynchronized (see :meth:`resync`).
+
+        Args:
+            timeout (float): Deadline in seconds. Defaults to
+                :attr:`timeout`.
 
         See Also:
             :meth:`fmt_cmd`: for the formatting and additional
                 parameters.
         """
-        assert cmd.endswith("?")
-        self.do(cmd, xx, *nn)
-        ret = await self._readline()
-        logger.debug("ret %s", ret)
+        deadline = self._deadline(timeout)
+        return await self._receive(self._query(cmd, xx, *nn), deadline)
+
+    async def ask_many(self, cmds, timeout=None):
+        """Execute several queries pipelined and return the responses.
+
+        All queries are sent before the first response is read, up to
+        :attr:`depth` queries in flight.
+
+        Args:
+            cmds (iterable of tuple): `(cmd, xx, *nn)` tuples, see
+                :meth:`fmt_cmd`
+            timeout (float): Deadline for all responses in seconds, see
+                :meth:`ask`.
+
+        Returns:
+            list(str): Responses
+        """
+        deadline = self._deadline(timeout)
+        depth = self.depth
+        futs = collections.deque()
+        ret = []
+        for cmd in cmds:
+            if depth is not None and len(futs) >= depth:
+                ret.append(await self._receive(futs.popleft(), deadline))
+            futs.append(self._query(*cmd))
+        while futs:
+            ret.append(await self._receive(futs.popleft(), deadline))
         return ret
 
+    def tune(self, tuner=None):
+        """Enable adaptive link tuning.
+
+        Round trip time and throughput are estimated from the query
+        timings and used to set :attr:`depth`, :attr:`line_length`,
+        :attr:`poll_interval` and the maximum :meth:`watch` rate.
+
+        Args:
+            tuner (LinkTuner): Tuner (default: new
+                :class:`newfocus8742.link.LinkTuner`).
+
+        Returns:
+            LinkTuner: The tuner.
+        """
+        if tuner is None:
+            from .link import LinkTuner
+            tuner = LinkTuner()
+        self.link = tuner
+        self._tune()
+        return tuner
+
+    def _tune(self):
+        link = self.link
+        self.depth = link.depth
+        self.line_length = link.line_length
+        if link.poll_interval is not None:
+            self.poll_interval = link.poll_interval
+
+    def link_info(self):
+        """Get the link estimates and tuning decisions.
+
+        Returns:
+            dict: See :meth:`newfocus8742.link.LinkTuner.info`, empty if
+                tuning is not enabled.
+        """
+        if self.link is None:
+            return {}
+        return self.link.info()
+
+    def flush(self):
+        """Drain the input buffer from read data.
+
+        Transports that can not discard buffered input synchronously
+        leave this to :meth:`resync`, which reads until the link is quiet.
+        """
+        pass
+
     def _writeline(self, cmd):
         raise NotImplemented
 
-    async def _readline(self):
+    async def _readline(self, timeout=None):
         raise NotImplemented
 
     identify = _make_ask("*IDN?",
@@ -134,7 +728,8 @@ class NewFocus8742Protocol:
     get_acceleration = _make_ask("AC?",
             """Get acceleration.
 
-            This command is used to query the acceleration value for an axis.""")
+            This command is used to query the acceleration value for an
+            axis.""", cache=True)
 
     set_home = _make_do("DH",
             """Set home position.
@@ -150,7 +745,7 @@ class NewFocus8742Protocol:
             """Get home position.
 
             This command is used to query the home position value for an
-            axis.""")
+            axis.""", cache=True)
 
     check_motor = _make_do("MC",
             """Motor check.
@@ -264,7 +859,8 @@ class NewFocus8742Protocol:
     get_velocity = _make_ask("VA?",
             """Get Velocity.
 
-            This command is used to query the velocity value for an axis.""")
+            This command is used to query the velocity value for an
+            axis.""", cache=True)
 
     stop = _make_do("ST",
             """Stop motion.
@@ -302,10 +898,205 @@ class NewFocus8742Protocol:
             error buffer is cleared by one(1) element. This means that an error
             can be read only once, with either command.""")
 
+    error = _make_ask("TB?",
+            """Query error code and message.
+
+            Like :meth:`error_message` but parsed into a tuple of code and
+            message, see :func:`parse_error`.""", conv=parse_error)
+
+    positions = _make_ask_all("TP?", "i4",
+            """Get actual positions of several axes.
+
+            All axes are queried in one pipelined exchange. Requires numpy.
+
+            Args:
+                axes (list(int)): Axes (default: all).
+
+            Returns:
+                numpy.ndarray: Positions (`int32`).""")
+
+    velocities = _make_ask_all("VA?", "i4",
+            """Get velocities of several axes.
+
+            See :meth:`positions`.""")
+
+    accelerations = _make_ask_all("AC?", "i4",
+            """Get accelerations of several axes.
+
+            See :meth:`positions`.""")
+
+    done_all = _make_ask_all("MD?", "?",
+            """Get motion done status of several axes.
+
+            See :meth:`positions`.
+
+            Returns:
+                numpy.ndarray: Motion done flags (`bool`).""")
+
+    async def warm(self, settings):
+        """Load known settings and verify them against the device.
+
+        All settings are queried in one pipelined exchange and the
+        responses are stored in :attr:`settings`.
+
+        Args:
+            settings (dict): Mapping from `(cmd, xx)` (e.g. `("VA", 1)`)
+                to the expected value.
+
+        Returns:
+            list: Keys of the settings that did not match.
+        """
+        keys = list(settings)
+        ret = await self.ask_many((cmd + "?", xx) for cmd, xx in keys)
+        mismatch = []
+        for key, r in zip(keys, ret):
+            r = int(r)
+            if r != settings[key]:
+                mismatch.append(key)
+            self.settings[key] = r
+        return mismatch
+
     async def finish(self, xx=None):
         while not await self.done(xx):
             await asyncio.sleep(self.poll_interval)
 
+    async def finish_many(self, axes):
+        """Wait for several axes to finish.
+
+        The motion status of all axes is polled in one pipelined exchange.
+        """
+        axes = list(axes)
+        while True:
+            ret = await self.ask_many(("MD?", xx) for xx in axes)
+            axes = [xx for xx, done in zip(axes, ret) if not int(done)]
+            if not axes:
+                break
+            await asyncio.sleep(self.poll_interval)
+
+    def track(self, interval=1.):
+        """Start tracking positions by dead-reckoning.
+
+        Args:
+            interval (float): Interval in seconds to verify the
+                predictions against the actual positions.
+
+        Returns:
+            Tracker: Position tracker.
+        """
+        from .tracker import Tracker
+        self.tracker = Tracker(self)
+        self.observers.append(self.tracker)
+        self._track_task = asyncio.ensure_future(self.tracker.run(interval))
+        return self.tracker
+
+    def estimate(self, xx):
+        """Get the predicted position of an axis without I/O.
+
+        Requires :meth:`track`.
+
+        Returns:
+            tuple: `(position, age)` where `age` is the time in seconds
+                since the prediction was last verified.
+        """
+        if self.tracker is None:
+            raise ValueError("position tracking not enabled")
+        return self.tracker.estimate(xx)
+
+    def setpoint(self, xx, relative=False, jog=False):
+        """Create a latest-wins setpoint channel for an axis.
+
+        See Also:
+            :class:`Setpoint`
+        """
+        return Setpoint(self, xx, relative, jog)
+
+    async def watch(self, axes=(1, 2, 3, 4), rate=100., until_done=True,
+                    maxsize=16, drop=True):
+        """Stream actual positions and motion status of several axes.
+
+        Positions (TP?) and motion status (MD?) of all axes are polled in
+        one pipelined exchange per tick. If the link can not sustain
+        `rate`, polling continues as fast as the exchanges complete.
+
+        Samples are buffered between the device link and the consumer so
+        that a slow consumer never stalls polling.
+
+        Args:
+            axes (list(int)): Axes to watch.
+            rate (float): Maximum poll rate in Hz.
+            until_done (bool): Stop once motion of all axes is done.
+            maxsize (int): Number of buffered samples.
+            drop (bool): Drop the oldest buffered sample when the buffer
+                is full instead of pausing polling.
+
+        Yields:
+            tuple: `(timestamp, positions, done)` with a `time.time()`
+                timestamp, a tuple of positions and a tuple of motion
+                done flags.
+        """
+        queue = asyncio.Queue(maxsize)
+        task = asyncio.ensure_future(
+            self._watch(queue, list(axes), 1/rate, until_done, drop))
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            task.cancel()
+
+    async def _watch(self, queue, axes, interval, until_done, drop):
+        cmds = [("TP?", xx) for xx in axes] + [("MD?", xx) for xx in axes]
+        n = len(axes)
+        try:
+            while True:
+                t0 = time.monotonic()
+                if self.link is not None:
+                    interval = max(interval,
+                                   1/self.link.telemetry_rate(len(cmds)))
+                ret = await self.ask_many(cmds)
+                item = (time.time(), tuple(int(r) for r in ret[:n]),
+                        tuple(bool(int(r)) for r in ret[n:]))
+                await self._put(queue, item, drop)
+                if until_done and all(item[2]):
+                    break
+                await asyncio.sleep(max(
+                    0., interval - (time.monotonic() - t0)))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await self._put(queue, e, drop)
+        else:
+            await self._put(queue, None, drop)
+
+    @staticmethod
+    async def _put(queue, item, drop):
+        if drop and queue.full():
+            queue.get_nowait()
+            logger.debug("watch sample dropped")
+        await queue.put(item)
+
+    def move_many(self, targets, relative=False):
+        """Start a coordinated move of several axes.
+
+        The move commands are packed into as few lines as possible so that
+        the axes start together.
+
+        Args:
+            targets (dict): Mapping from axis to target position (or
+                distance if `relative`).
+            relative (bool): Relative (PR) instead of absolute (PA) move.
+
+        Returns:
+            Move: Handle to wait for or cancel the move.
+        """
+        cmd = "PR" if relative else "PA"
+        self.do_many((cmd, xx, n) for xx, n in targets.items())
+        return Move({self: list(targets)})
+
     async def ping(self):
         try:
             await self.ask("VE?")
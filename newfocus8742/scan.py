@@ -0,0 +1,244 @@
+"""Scan path planning.
+
+Orders the target points of multi-axis (raster, alignment) scans to
+reduce the total scan time and the number of direction reversals and
+feeds them to :meth:`NewFocus8742Protocol.move_many`.
+
+Move times are estimated with a trapezoidal velocity profile. Axes move
+concurrently, the slowest axis determines the time of a move. Each
+direction reversal of an axis (which costs acceleration and open-loop
+backlash) adds a configurable penalty.
+"""
+
+import logging
+import asyncio
+import math
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def move_time(d, v, a):
+    """Duration of a move of length `d` with velocity `v` and
+    acceleration `a` (trapezoidal profile)."""
+    d = abs(d)
+    if d*a >= v**2:
+        return d/v + v/a
+    return 2*math.sqrt(d/a)
+
+
+def serpentine(points):
+    """Order points on a grid in a serpentine (boustrophedon) pattern.
+
+    The first coordinate is the slowest. Each faster coordinate alternates
+    its direction.
+    """
+    points = sorted(points)
+    if not points or len(points[0]) < 2:
+        return points
+    rows = []
+    for p in points:
+        if rows and rows[-1][0][0] == p[0]:
+            rows[-1].append(p)
+        else:
+            rows.append([p])
+    path = []
+    for i, row in enumerate(rows):
+        x = row[0][0]
+        row = [(x,) + q for q in serpentine([p[1:] for p in row])]
+        path.extend(reversed(row) if i % 2 else row)
+    return path
+
+
+class Planner:
+    """Scan path planner.
+
+    Args:
+        velocity (float or list(float)): Velocity in steps/s per axis.
+        acceleration (float or list(float)): Acceleration in steps/s² per
+            axis.
+        reversal (float): Time penalty in seconds per direction reversal
+            of an axis.
+        dwell (float): Time spent at each point in seconds.
+    """
+    def __init__(self, velocity=2000., acceleration=100000., reversal=0.,
+                 dwell=0.):
+        self.velocity = velocity
+        self.acceleration = acceleration
+        self.reversal = reversal
+        self.dwell = dwell
+
+    @classmethod
+    async def from_device(cls, dev, axes, **kwargs):
+        """Create a planner with the velocities and accelerations of the
+        axes of a controller (in one pipelined exchange)."""
+        ret = await dev.ask_many([("VA?", xx) for xx in axes] +
+                                 [("AC?", xx) for xx in axes])
+        ret = [int(r) for r in ret]
+        n = len(axes)
+        return cls(ret[:n], ret[n:], **kwargs)
+
+    def _params(self, n):
+        v, a = self.velocity, self.acceleration
+        if not isinstance(v, (list, tuple)):
+            v = [v]*n
+        if not isinstance(a, (list, tuple)):
+            a = [a]*n
+        return v, a
+
+    def _edge_time(self, n):
+        # move time function for points with `n` coordinates
+        va = list(zip(*self._params(n)))
+
+        def edge(p, q):
+            return max(move_time(qi - pi, vi, ai)
+                       for pi, qi, (vi, ai) in zip(p, q, va))
+        return edge
+
+    def _node(self, p, q, r):
+        # reversal penalty at q
+        return self.reversal*sum(
+            1 for pi, qi, ri in zip(p, q, r) if (qi - pi)*(ri - qi) < 0)
+
+    def estimate(self, path, start=None):
+        """Estimate the duration of a scan.
+
+        Args:
+            path (list(tuple)): Points in scan order.
+            start (tuple): Start position (default: first point).
+
+        Returns:
+            float: Duration in seconds.
+        """
+        path = list(path)
+        if start is not None:
+            path.insert(0, tuple(start))
+        t = self.dwell*len(path)
+        if not path:
+            return t
+        edge = self._edge_time(len(path[0]))
+        for k in range(1, len(path)):
+            t += edge(path[k - 1], path[k])
+            if k + 1 < len(path):
+                t += self._node(path[k - 1], path[k], path[k + 1])
+        return t
+
+    def nearest(self, points, start=None):
+        """Order points greedily by nearest (in time) neighbor."""
+        todo = list(points)
+        if not todo:
+            return []
+        edge = self._edge_time(len(todo[0]))
+        p = tuple(start) if start is not None else todo.pop(0)
+        path = [] if start is not None else [p]
+        while todo:
+            i = min(range(len(todo)), key=lambda i: edge(p, todo[i]))
+            p = todo.pop(i)
+            path.append(p)
+        return path
+
+    def tour(self, points, start=None, max_passes=20, max_time=1.):
+        """Order points by a time-weighted tour.
+
+        The nearest neighbor order is improved with 2-opt moves using the
+        move time and reversal penalty model. 2-opt is quadratic in the
+        number of points per pass and stops after `max_passes` passes or
+        `max_time` seconds, whichever comes first.
+        """
+        path = self.nearest(points, start)
+        if start is not None:
+            path.insert(0, tuple(start))
+        n = len(path)
+        if n < 3:
+            return path[1:] if start is not None else path
+        e, r = self._edge_time(len(path[0])), self._node
+        deadline = time.monotonic() + max_time
+
+        def node(k, a, b, c):
+            return r(a, b, c) if 1 <= k < n - 1 else 0.
+
+        def g(k):
+            return P[k] if 0 <= k < n else None
+
+        P = path
+        for _ in range(max_passes):
+            improved = False
+            for i in range(1, n - 1):
+                if time.monotonic() > deadline:
+                    logger.info("2-opt time budget exhausted")
+                    break
+                for j in range(i + 1, n):
+                    old = e(P[i - 1], P[i]) + node(
+                        i - 1, g(i - 2), P[i - 1], P[i]) + node(
+                        i, P[i - 1], P[i], g(i + 1)) + node(
+                        j, P[j - 1], P[j], g(j + 1))
+                    new = e(P[i - 1], P[j]) + node(
+                        i - 1, g(i - 2), P[i - 1], P[j]) + node(
+                        i, P[i - 1], P[j], P[j - 1]) + node(
+                        j, g(i + 1) if j > i + 1 else P[j], P[i], g(j + 1))
+                    if j + 1 < n:
+                        old += e(P[j], P[j + 1]) + node(
+                            j + 1, P[j], P[j + 1], g(j + 2))
+                        new += e(P[i], P[j + 1]) + node(
+                            j + 1, P[i], P[j + 1], g(j + 2))
+                    if new < old - 1e-9:
+                        P[i:j + 1] = P[i:j + 1][::-1]
+                        improved = True
+            if not improved or time.monotonic() > deadline:
+                break
+        if start is not None:
+            path.pop(0)
+        return path
+
+    def order(self, points, method=None, start=None):
+        """Order scan points.
+
+        Args:
+            points (list(tuple)): Target points, one coordinate per axis.
+            method (str): `"serpentine"` (grids), `"nearest"` or `"tour"`
+                (see :meth:`tour`, slow for many points). Defaults to
+                `"serpentine"` if the points form a complete grid and to
+                `"nearest"` otherwise.
+            start (tuple): Start position.
+
+        Returns:
+            list(tuple): Points in scan order.
+        """
+        points = [tuple(p) for p in points]
+        if method is None:
+            method = "serpentine" if _is_grid(points) else "nearest"
+        if method == "serpentine":
+            return serpentine(points)
+        elif method == "nearest":
+            return self.nearest(points, start)
+        elif method == "tour":
+            return self.tour(points, start)
+        raise ValueError("unknown method {}".format(method))
+
+
+def _is_grid(points):
+    if not points:
+        return True
+    n = 1
+    for k in range(len(points[0])):
+        n *= len({p[k] for p in points})
+    return n == len(set(points))
+
+
+async def scan(dev, axes, path, callback=None):
+    """Move through the scan points in order.
+
+    Args:
+        dev (NewFocus8742Protocol): Driver instance.
+        axes (list(int)): Axes, in the order of the point coordinates.
+        path (list(tuple)): Points in scan order, see
+            :meth:`Planner.order`.
+        callback (callable): Called (and awaited if it returns an
+            awaitable) with each point after it has been reached.
+    """
+    for p in path:
+        await dev.move_many(dict(zip(axes, p)))
+        if callback is not None:
+            ret = callback(p)
+            if asyncio.iscoroutine(ret):
+                await ret
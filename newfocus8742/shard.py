@@ -0,0 +1,153 @@
+"""Sharded multi-process operation of aqctl_newfocus8742.
+
+A supervisor distributes the controllers over several worker processes
+(each a regular aqctl_newfocus8742 with its own event loop) and restarts
+them when they fail. A single RPC front end routes calls for each
+controller to the worker that owns it.
+"""
+
+import logging
+import asyncio
+import sys
+import types
+
+from sipyco.pc_rpc import AsyncioClient
+
+logger = logging.getLogger(__name__)
+
+
+class Worker:
+    """Supervised worker process.
+
+    Args:
+        argv (list(str)): Arguments to aqctl_newfocus8742.
+        restart_delay (float): Delay before restarting a failed worker in
+            seconds.
+    """
+    def __init__(self, argv, restart_delay=1.):
+        self.argv = argv
+        self.restart_delay = restart_delay
+        self.process = None
+        self.restarts = 0
+        self._stopping = False
+
+    async def run(self):
+        """Run the worker and restart it whenever it exits."""
+        while not self._stopping:
+            self.process = await asyncio.create_subprocess_exec(
+                sys.executable, "-m", "newfocus8742.aqctl_newfocus8742",
+                *self.argv)
+            ret = await self.process.wait()
+            if self._stopping:
+                break
+            self.restarts += 1
+            logger.warning("worker %s exited (%s), restarting",
+                           self.argv, ret)
+            await asyncio.sleep(self.restart_delay)
+
+    async def stop(self):
+        self._stopping = True
+        if self.process is not None and self.process.returncode is None:
+            self.process.terminate()
+            await self.process.wait()
+
+
+class ShardPool:
+    """Pool of RPC connections to a controller served by a worker.
+
+    Args:
+        host (str): Worker host.
+        port (int): Worker RPC port.
+        target (str): Target name at the worker.
+        connections (int): Maximum number of concurrent calls (and
+            connections to the worker).
+    """
+    def __init__(self, host, port, target, connections=4):
+        self._address = host, port, target
+        self._pool = asyncio.Queue()
+        for i in range(connections):
+            self._pool.put_nowait(None)  # connected on first use
+
+    async def call(self, name, *args, **kwargs):
+        """Call a method of the target at the worker."""
+        client = await self._pool.get()
+        try:
+            if client is None:
+                client = AsyncioClient()
+                try:
+                    await client.connect_rpc(*self._address)
+                except:
+                    client = None
+                    raise
+            try:
+                return await getattr(client, name)(*args, **kwargs)
+            except (ConnectionError, EOFError, asyncio.IncompleteReadError):
+                # worker died, reconnect on next use
+                client.close_rpc()
+                client = None
+                raise
+        finally:
+            self._pool.put_nowait(client)
+
+    def close(self):
+        while not self._pool.empty():
+            client = self._pool.get_nowait()
+            if client is not None:
+                client.close_rpc()
+
+
+def _methods():
+    # public methods of the workers' targets (see `Controller`) and their
+    # docstrings
+    from .controller import Controller
+    from .protocol import NewFocus8742Protocol
+    methods = {}
+    for cls in NewFocus8742Protocol, Controller:
+        for name in dir(cls):
+            method = getattr(cls, name)
+            if not name.startswith("_") and callable(method):
+                methods[name] = method.__doc__
+    # closing is up to the worker
+    del methods["close"]
+    return methods
+
+
+class ShardProxy:
+    """RPC target forwarding calls to a controller served by a worker.
+
+    The methods of :class:`newfocus8742.controller.Controller` (and thus
+    of the driver) are exposed as bound methods so that the RPC server
+    lists them. `close()` is not forwarded.
+
+    Args:
+        pool (ShardPool): Connections to the worker.
+    """
+    _methods = None
+
+    def __init__(self, pool):
+        self._shard_pool = pool
+        if ShardProxy._methods is None:
+            ShardProxy._methods = _methods()
+
+    def __getattr__(self, name):
+        if name.startswith("_") or name not in self._methods:
+            raise AttributeError(name)
+
+        async def forward(self, *args, **kwargs):
+            return await self._shard_pool.call(name, *args, **kwargs)
+        forward.__name__ = name
+        forward.__doc__ = self._methods[name]
+        return types.MethodType(forward, self)
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(self._methods))
+
+
+def shard(devices, n):
+    """Distribute devices round-robin over `n` shards.
+
+    Returns:
+        list(list): Device indices per shard (without empty shards).
+    """
+    shards = [list(range(i, len(devices), n)) for i in range(n)]
+    return [s for s in shards if s]
@@ -0,0 +1,143 @@
+"""Position telemetry ring buffer in shared memory.
+
+The controller process appends timestamped samples to a fixed-size ring
+buffer backed by a memory-mapped file (e.g. in `/dev/shm`). Other
+processes map the same file and read the samples without copying, without
+locks and without going through the controller process.
+
+The file consists of a header followed by the sample records. The header
+holds the total number of samples ever written (`seq`). A sample with
+sequence number `i` is stored at index `i % size`. The writer stores the
+record before incrementing `seq`.
+"""
+
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MAGIC = 0x32343738  # "8742"
+
+header_dtype = np.dtype([
+    ("magic", "<u8"),
+    ("seq", "<u8"),
+    ("size", "<u8"),
+    ("axes", "<u8"),
+])
+
+
+def sample_dtype(axes=4):
+    """Record layout of one sample.
+
+    Args:
+        axes (int): Number of axes per sample.
+    """
+    return np.dtype([
+        ("time", "<f8"),
+        ("position", "<i4", (axes,)),
+        ("done", "u1", (axes,)),
+    ])
+
+
+def _map(path, mode, size=None, axes=None):
+    create = mode == "w+"
+    if create:
+        # size the file once, mapping it again with "w+" would truncate it
+        with open(path, "wb") as f:
+            f.truncate(header_dtype.itemsize +
+                       size*sample_dtype(axes).itemsize)
+        mode = "r+"
+    header = np.memmap(path, header_dtype, mode, shape=(1,))[0]
+    if create:
+        header["magic"] = MAGIC
+        header["size"] = size
+        header["axes"] = axes
+    if header["magic"] != MAGIC:
+        raise ValueError("not a telemetry ring buffer: {}".format(path))
+    data = np.memmap(path, sample_dtype(int(header["axes"])), mode,
+                     offset=header_dtype.itemsize,
+                     shape=(int(header["size"]),))
+    return header, data
+
+
+class RingWriter:
+    """Writer side of the ring buffer.
+
+    Args:
+        path (str): File to create, e.g. `/dev/shm/newfocus8742`.
+        size (int): Number of samples in the ring buffer.
+        axes (int): Number of axes per sample.
+    """
+    def __init__(self, path, size=1 << 16, axes=4):
+        self.header, self.data = _map(path, "w+", size, axes)
+
+    def append(self, timestamp, position, done):
+        """Append a sample."""
+        seq = int(self.header["seq"])
+        d = self.data[seq % len(self.data)]
+        d["time"] = timestamp
+        d["position"] = position
+        d["done"] = done
+        self.header["seq"] = seq + 1
+
+    def close(self):
+        self.data.flush()
+
+
+class RingReader:
+    """Reader side of the ring buffer.
+
+    Samples are returned as views into the shared memory. A view is only
+    valid as long as the writer has not overwritten it, use :meth:`valid`
+    to check this after processing.
+
+    Args:
+        path (str): File created by :class:`RingWriter`.
+    """
+    def __init__(self, path):
+        self.header, self.data = _map(path, "r")
+
+    @property
+    def seq(self):
+        """Total number of samples written."""
+        return int(self.header["seq"])
+
+    def read(self, start=None):
+        """Get the samples written since `start`.
+
+        The sample currently being written is never returned. If samples
+        since `start` have already been overwritten, reading starts at the
+        oldest available sample.
+
+        Args:
+            start (int): Sequence number of the first sample. Defaults to
+                the oldest available sample.
+
+        Returns:
+            tuple: `(start, end, views)` where `views` are up to two
+                contiguous views (due to wrap-around) of the samples with
+                sequence numbers from `start` up to `end` (exclusive).
+        """
+        end = self.seq
+        size = len(self.data)
+        oldest = max(0, end - size + 1)
+        if start is None or start < oldest:
+            start = oldest
+        i, j = start % size, end % size
+        if i <= j:
+            views = [self.data[i:j]]
+        else:
+            views = [self.data[i:], self.data[:j]]
+        return start, end, views
+
+    def latest(self):
+        """Get the latest sample (as a view) or `None`."""
+        seq = self.seq
+        if not seq:
+            return None
+        return self.data[(seq - 1) % len(self.data)]
+
+    def valid(self, start):
+        """Check whether samples since `start` are still unmodified."""
+        return self.seq - start < len(self.data)
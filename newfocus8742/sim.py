@@ -14,7 +14,8 @@ class NewFocus8742Sim(NewFocus8742Protocol):
     channels = 4
 
     def __init__(self):
-        self.position = [0 for i in range(self.channels)]
+        super().__init__()
+        self.steps = [0 for i in range(self.channels)]
         self.home = [0 for i in range(self.channels)]
         self.target = [0 for i in range(self.channels)]
         self.velocity = [2000 for i in range(self.channels)]
@@ -43,19 +44,35 @@ class NewFocus8742Sim(NewFocus8742Protocol):
         if self.pending:
             raise ValueError("pending data {}".format(self.pending))
 
-    def _writeline(self, cmd):
-        m = re.match(r"^(?P<xx>\d)?\s*\*?(?P<cmd>[a-zA-Z]+)\s*"
-                r"(?P<nn>\d+(,\s*\d+)*)?(?P<ask>\?)?$", cmd)
+    def _writeline(self, line):
+        for cmd in line.split(";"):
+            self._execute(cmd)
+
+    @classmethod
+    def _command_table(cls):
+        # parser and handler table, built on first use
+        if "_commands" not in cls.__dict__:
+            cls._cmd_re = re.compile(r"^(?P<xx>\d)?\s*\*?(?P<cmd>[a-zA-Z]+)\s*"
+                    r"(?P<nn>[+-]|-?\d+(,\s*-?\d+)*)?(?P<ask>\?)?$")
+            cls._commands = {name for name in dir(cls)
+                             if name.startswith(("ask_", "do_"))}
+        return cls._cmd_re, cls._commands
+
+    def _execute(self, cmd):
+        cmd_re, commands = self._command_table()
+        m = cmd_re.match(cmd)
         assert m
         d = m.groupdict()
-        if d["ask"] == "?":
-            f = getattr(self, "ask_{}".format(d["cmd"].lower()), None)
-        else:
-            f = getattr(self, "do_{}".format(d["cmd"].lower()), None)
+        name = "{}_{}".format("ask" if d["ask"] == "?" else "do",
+                              d["cmd"].lower())
+        f = getattr(self, name) if name in commands else None
         kwargs = {}
         if d["xx"] is not None:
             kwargs["xx"] = int(d["xx"])
-        if d["nn"]:
+        if d["nn"] in ("+", "-"):
+            # MV direction
+            args = (int(d["nn"] + "1"),)
+        elif d["nn"]:
             args = tuple(int(i) for i in d["nn"].split(","))
         else:
             args = ()
@@ -68,7 +85,13 @@ class NewFocus8742Sim(NewFocus8742Protocol):
             assert ret
             self.pending.append(ret)
 
-    async def _readline(self):
+    def flush(self):
+        self.pending.clear()
+
+    async def _readline(self, timeout=None):
+        if not self.pending:
+            # lost response
+            await asyncio.wait_for(asyncio.Event().wait(), timeout)
         return self.pending.pop(0)
 
     def ask_tb(self):
@@ -78,7 +101,7 @@ class NewFocus8742Sim(NewFocus8742Protocol):
         return 0
 
     def ask_idn(self):
-        return "Newfocus 8742, simulated"
+        return "New_Focus 8742 vsim 01/01/00 simulated"
 
     def do_va(self, nn, xx):
         assert 1 <= xx <= 4
@@ -90,15 +113,15 @@ class NewFocus8742Sim(NewFocus8742Protocol):
 
     def do_pa(self, nn, xx):
         assert 1 <= xx <= 4
-        self.position[xx - 1] = nn
+        self.steps[xx - 1] = nn
 
     def ask_pa(self, xx):
         assert 1 <= xx <= 4
-        return self.position[xx - 1]
+        return self.steps[xx - 1]
 
     def do_pr(self, nn, xx):
         assert 1 <= xx <= 4
-        self.position[xx - 1] += nn
+        self.steps[xx - 1] += nn
 
     def ask_pr(self, xx):
         assert 1 <= xx <= 4
@@ -106,7 +129,7 @@ class NewFocus8742Sim(NewFocus8742Protocol):
 
     def ask_tp(self, xx):
         assert 1 <= xx <= 4
-        return self.position[xx - 1] - self.home[xx - 1]
+        return self.steps[xx - 1] - self.home[xx - 1]
 
     def do_ac(self, nn, xx):
         assert 1 <= xx <= 4
@@ -122,6 +145,9 @@ class NewFocus8742Sim(NewFocus8742Protocol):
     def do_ab(self, xx=None):
         pass
 
+    def do_st(self, xx=None):
+        pass
+
     def do_qm(self, *nn, xx):
         assert 1 <= xx <= 4
         pass
@@ -136,7 +162,7 @@ class NewFocus8742Sim(NewFocus8742Protocol):
     def do_dh(self, *nn, xx):
         assert 1 <= xx <= 4
         nn = nn[0] if nn else 0
-        self.position[xx - 1] += self.home[xx - 1] - nn
+        self.steps[xx - 1] += self.home[xx - 1] - nn
         self.home[xx - 1] = nn
 
     def ask_md(self, xx):
@@ -146,7 +172,7 @@ class NewFocus8742Sim(NewFocus8742Protocol):
     def do_mv(self, *nn, xx):
         assert 1 <= xx <= 4
         nn = nn[0] if nn else 1
-        self.position[xx - 1] += nn
+        self.steps[xx - 1] += nn
 
     def ask_sa(self):
         return 0
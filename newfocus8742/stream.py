@@ -0,0 +1,167 @@
+"""Binary telemetry streaming.
+
+A compact alternative to RPC for high rate position telemetry. Each
+message on the stream is a little-endian `uint32` payload length followed
+by the payload: a batch of fixed-layout frames (:data:`FRAME`), one per
+sample:
+
+    ========= ======== ============================================
+    field     format   description
+    ========= ======== ============================================
+    time      float64  `time.time()` timestamp
+    controller uint16  controller index
+    position  4×int32  actual positions of axes 1-4
+    done      uint8    motion done flags, bit `i` for axis `i + 1`
+    ========= ======== ============================================
+"""
+
+import logging
+import asyncio
+import struct
+
+logger = logging.getLogger(__name__)
+
+FRAME = struct.Struct("<dH4iB")
+LENGTH = struct.Struct("<I")
+
+
+def frame_dtype():
+    """numpy dtype of a frame."""
+    import numpy as np
+    return np.dtype([
+        ("time", "<f8"),
+        ("controller", "<u2"),
+        ("position", "<i4", (4,)),
+        ("done", "u1"),
+    ])
+
+
+class StreamServer:
+    """Binary telemetry streaming server.
+
+    Frames published are batched and written to all clients every
+    `interval`. A client whose write buffer exceeds `max_buffer` does not
+    receive new batches until it has caught up, so slow clients never
+    stall the publisher.
+
+    Args:
+        interval (float): Batching interval in seconds.
+        max_buffer (int): Per-client write buffer limit in bytes.
+    """
+    def __init__(self, interval=.01, max_buffer=1 << 20):
+        self.interval = interval
+        self.max_buffer = max_buffer
+        self.clients = {}  # writer: number of batches dropped
+        self._batch = []
+        self._flush_handle = None
+        self._server = None
+
+    async def start(self, host, port):
+        """Start listening."""
+        self._server = await asyncio.start_server(self._handle, host, port)
+
+    async def stop(self):
+        """Stop listening and disconnect all clients."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._batch.clear()
+        # clients never send anything, close them before waiting for the
+        # server: wait_closed() waits for all connections on Python 3.12+
+        for writer in list(self.clients):
+            writer.close()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self.clients[writer] = 0
+        try:
+            while await reader.read(1 << 10):
+                pass  # clients do not send anything
+        except ConnectionError:
+            pass
+        finally:
+            dropped = self.clients.pop(writer, 0)
+            if dropped:
+                logger.info("client dropped %s batches", dropped)
+            writer.close()
+
+    def publish(self, timestamp, controller, position, done):
+        """Publish a sample."""
+        bits = 0
+        for i, d in enumerate(done):
+            bits |= bool(d) << i
+        self._batch.append(FRAME.pack(timestamp, controller, *position,
+                                      bits))
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_event_loop().call_later(
+                self.interval, self._flush)
+
+    def _flush(self):
+        self._flush_handle = None
+        payload = b"".join(self._batch)
+        self._batch.clear()
+        msg = LENGTH.pack(len(payload)) + payload
+        for writer in self.clients:
+            if writer.transport.get_write_buffer_size() > self.max_buffer:
+                self.clients[writer] += 1
+            else:
+                writer.write(msg)
+
+    def sink(self, controller):
+        """Get a sink for :func:`newfocus8742.controller.record` that
+        publishes samples of a controller."""
+        return _Sink(self, controller)
+
+
+class _Sink:
+    def __init__(self, server, controller):
+        self.server = server
+        self.controller = controller
+
+    def append(self, timestamp, position, done):
+        self.server.publish(timestamp, self.controller, position, done)
+
+
+class StreamClient:
+    """Binary telemetry streaming client.
+
+    Decodes batches directly into numpy structured arrays (see
+    :func:`frame_dtype`)::
+
+        client = StreamClient()
+        await client.connect("::1", 3259)
+        async for frames in client:
+            print(frames["time"], frames["position"])
+    """
+    def __init__(self):
+        self.dtype = frame_dtype()
+        self._reader = self._writer = None
+
+    async def connect(self, host, port):
+        self._reader, self._writer = await asyncio.open_connection(
+            host, port)
+
+    async def read(self):
+        """Read the next batch of frames.
+
+        Returns:
+            numpy.ndarray: Frames (read-only view of the received bytes).
+        """
+        import numpy as np
+        length, = LENGTH.unpack(await self._reader.readexactly(LENGTH.size))
+        payload = await self._reader.readexactly(length)
+        return np.frombuffer(payload, self.dtype)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return await self.read()
+        except asyncio.IncompleteReadError:
+            raise StopAsyncIteration
+
+    def close(self):
+        self._writer.close()
@@ -0,0 +1,90 @@
+"""Synchronous, thread-safe client.
+
+For non-async code (notebooks, scripts). The driver runs on a persistent
+event loop in a background thread. Calls from any thread are submitted
+to that loop, so several threads can share one connection.
+"""
+
+import asyncio
+import functools
+import inspect
+import threading
+
+from .controller import Controller
+
+
+class SyncClient:
+    """Synchronous facade for a driver.
+
+    All public driver methods are available as blocking methods. Other
+    awaitables returned (e.g. the :class:`Move` from
+    :meth:`NewFocus8742Protocol.move_many`) can be waited for with
+    :meth:`run`::
+
+        dev = SyncClient(NewFocus8742TCP.connect, "8742-37565")
+        dev.set_relative(1, 100)
+        dev.finish(1)
+        print(dev.position(1))
+
+    Args:
+        connect (coroutine function): Driver connect method, e.g.
+            :meth:`NewFocus8742TCP.connect`.
+        *args, **kwargs: Passed to `connect`.
+    """
+    def __init__(self, connect, *args, **kwargs):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever,
+                                       name="newfocus8742", daemon=True)
+        self.thread.start()
+        try:
+            self.dev = self.run(connect(*args, **kwargs))
+        except:
+            self._stop()
+            raise
+        self._ctrl = Controller(self.dev)
+
+    def run(self, aw):
+        """Run an awaitable on the event loop and return its result."""
+        async def wrap():
+            return await aw
+        return asyncio.run_coroutine_threadsafe(wrap(), self.loop).result()
+
+    def _call(self, method, *args, **kwargs):
+        async def call():
+            ret = method(*args, **kwargs)
+            if inspect.iscoroutine(ret):
+                ret = await ret
+            return ret
+        return asyncio.run_coroutine_threadsafe(call(), self.loop).result()
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        method = getattr(self.dev, name)
+        if not callable(method):
+            return method
+        return functools.partial(self._call, method)
+
+    def call_many(self, calls):
+        """Execute several calls with one thread crossing.
+
+        See Also:
+            :meth:`Controller.batch`: for the call format, pipelining and
+                results.
+        """
+        return self.run(self._ctrl.batch(calls))
+
+    def _stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+    def close(self):
+        self._call(self.dev.close)
+        self._stop()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
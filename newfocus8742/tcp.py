@@ -11,6 +11,7 @@ class NewFocus8742TCP(NewFocus8742Protocol):
     eol_read = b"\r\n"
 
     def __init__(self, reader, writer):
+        super().__init__()
         self._reader = reader
         self._writer = writer
 
@@ -39,10 +40,23 @@ class NewFocus8742TCP(NewFocus8742Protocol):
     def close(self):
         self._writer.close()
 
+    async def _drain(self):
+        # discard raw input (including partial lines) until quiet
+        while True:
+            try:
+                r = await asyncio.wait_for(self._reader.read(1 << 10),
+                                           self.quiet)
+            except asyncio.TimeoutError:
+                break
+            if not r:
+                break  # EOF
+            self.stats["stale"] += r.count(self.eol_read[-1:])
+            logger.debug("stale input %s", r)
+
     def _writeline(self, cmd):
         self._writer.write(cmd.encode() + self.eol_write)
 
-    async def _readline(self):
-        r = await self._reader.readline()
+    async def _readline(self, timeout=None):
+        r = await asyncio.wait_for(self._reader.readline(), timeout)
         assert r.endswith(self.eol_read)
         return r[:-2].decode()
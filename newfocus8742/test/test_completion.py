@@ -0,0 +1,77 @@
+import asyncio
+import unittest
+
+from newfocus8742.sim import NewFocus8742Sim
+from newfocus8742.controller import Completion
+
+
+class LatencySim(NewFocus8742Sim):
+    """Simulation with link latency and controllable motion status."""
+    latency = .005
+
+    def __init__(self):
+        super().__init__()
+        self.busy = {}
+        self.on_md = None
+
+    def ask_md(self, xx):
+        return 0 if self.busy.get(xx) else 1
+
+    def _writeline(self, line):
+        super()._writeline(line)
+        if self.on_md is not None and "1MD?" in line:
+            cb, self.on_md = self.on_md, None
+            asyncio.get_event_loop().call_soon(cb)
+
+    async def _readline(self, timeout=None):
+        await asyncio.sleep(self.latency)
+        return await super()._readline(timeout)
+
+
+class CompletionTest(unittest.TestCase):
+    def test_done(self):
+        async def f():
+            dev = LatencySim()
+            published = []
+            completion = Completion(dev, published.append)
+            task = asyncio.ensure_future(completion.run())
+            dev.busy[2] = True
+            dev.set_relative(2, 5)
+            fut = asyncio.ensure_future(completion.wait(2))
+            await asyncio.sleep(.03)
+            self.assertFalse(fut.done())
+            dev.busy[2] = False
+            msg = await asyncio.wait_for(fut, 1)
+            task.cancel()
+            return msg, published
+        msg, published = asyncio.run(f())
+        self.assertEqual(msg["axis"], 2)
+        self.assertEqual(msg["position"], 5)
+        self.assertEqual(published, [msg])
+
+    def test_stale_reply(self):
+        # a move issued while a poll is in flight is not completed by the
+        # poll's reply
+        async def f():
+            dev = LatencySim()
+            completion = Completion(dev)
+            task = asyncio.ensure_future(completion.run())
+            futs = []
+
+            def move():
+                dev.busy[1] = True
+                dev.set_relative(1, 10)
+                futs.append(asyncio.ensure_future(completion.wait(1)))
+            dev.on_md = move
+            first = asyncio.ensure_future(completion.wait(1))
+            await asyncio.sleep(.05)
+            self.assertEqual(len(futs), 1)
+            self.assertFalse(futs[0].done())
+            self.assertFalse(first.done())
+            dev.busy[1] = False
+            msg = await asyncio.wait_for(futs[0], 1)
+            self.assertEqual(await first, msg)
+            task.cancel()
+            return msg
+        msg = asyncio.run(f())
+        self.assertEqual(msg["position"], 10)
@@ -0,0 +1,73 @@
+import asyncio
+import unittest
+
+from newfocus8742.sim import NewFocus8742Sim
+
+
+class Sim(NewFocus8742Sim):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+    def _writeline(self, line):
+        self.lines.append(line)
+        super()._writeline(line)
+
+
+class CorkTest(unittest.TestCase):
+    def test_auto(self):
+        async def f():
+            dev = Sim()
+            dev.corking = True
+            dev.set_velocity(1, 100)
+            dev.set_velocity(2, 200)
+            dev.set_relative(1, 10)
+            self.assertEqual(dev.lines, [])
+            await asyncio.sleep(0)
+            return dev
+        dev = asyncio.run(f())
+        self.assertEqual(dev.lines, ["1VA100;2VA200;1PR10"])
+        self.assertEqual(dev.stats["transfers_saved"], 2)
+
+    def test_query(self):
+        async def f():
+            dev = Sim()
+            with dev.batch():
+                dev.set_velocity(1, 100)
+                self.assertEqual(await dev.get_velocity(1), 100)
+                dev.set_relative(1, 10)
+            return dev
+        dev = asyncio.run(f())
+        self.assertEqual(dev.lines, ["1VA100", "1VA?", "1PR10"])
+
+    def test_per_task(self):
+        async def batch(dev):
+            async with dev.batch():
+                dev.set_velocity(1, 100)
+                await asyncio.sleep(.01)
+                dev.set_velocity(2, 200)
+
+        async def other(dev):
+            dev.set_velocity(3, 300)
+
+        async def f():
+            dev = Sim()
+            await asyncio.gather(batch(dev), other(dev))
+            return dev
+        dev = asyncio.run(f())
+        self.assertEqual(dev.lines, ["3VA300", "1VA100;2VA200"])
+
+    def test_stop(self):
+        async def f():
+            dev = Sim()
+            async with dev.batch():
+                dev.set_relative(1, 100)
+                dev.stop(1)
+                self.assertEqual(dev.lines, ["1PR100", "1ST"])
+                dev.set_relative(2, 100)
+                dev.abort()
+                dev.set_relative(3, 100)
+            return dev
+        dev = asyncio.run(f())
+        self.assertEqual(dev.lines, ["1PR100", "1ST", "2PR100", "AB",
+                                     "3PR100"])
@@ -0,0 +1,38 @@
+import asyncio
+import unittest
+
+from newfocus8742.sim import NewFocus8742Sim
+from newfocus8742.tcp import NewFocus8742TCP
+
+try:
+    import numpy as np
+    from newfocus8742.fleet import Fleet
+except ImportError:
+    np = None
+
+
+class SimTest(unittest.TestCase):
+    def test_position(self):
+        async def f():
+            dev = NewFocus8742Sim()
+            dev.set_relative(2, -5)
+            return await dev.position(2)
+        self.assertEqual(asyncio.run(f()), -5)
+
+
+@unittest.skipIf(np is None, "numpy not available")
+class FleetTest(unittest.TestCase):
+    def test_position(self):
+        async def f():
+            fleet = Fleet(3)
+            fleet[1].set_relative(2, 7)
+            self.assertEqual(await fleet[1].position(2), 7)
+            ports = await fleet.serve()
+            dev = await NewFocus8742TCP.connect("127.0.0.1", ports[1])
+            dev.set_relative(2, 3)
+            self.assertEqual(await dev.position(2), 10)
+            dev.close()
+            fleet.close()
+            return fleet
+        fleet = asyncio.run(f())
+        np.testing.assert_equal(fleet.steps[:, 1], [0, 10, 0])
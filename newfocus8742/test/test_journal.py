@@ -0,0 +1,48 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+from newfocus8742.journal import Journal
+from newfocus8742.sim import NewFocus8742Sim
+
+
+class JournalTest(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        os.close(fd)
+
+    def tearDown(self):
+        os.unlink(self.path)
+
+    def entry(self, cmd, xx, value):
+        return json.dumps({"serial": "1", "kind": "setting", "cmd": cmd,
+                           "xx": xx, "value": value}) + "\n"
+
+    def test_truncated(self):
+        with open(self.path, "w") as f:
+            f.write(self.entry("VA", 1, 100))
+            f.write(self.entry("VA", 1, 200))
+            f.write(self.entry("AC", 2, 300)[:20])
+        with self.assertLogs("newfocus8742.journal", "WARNING"):
+            journal = Journal(self.path)
+        self.assertEqual(journal.state, {"1": {("setting", "VA", 1): 200}})
+        with open(self.path) as f:
+            self.assertEqual(f.read(), self.entry("VA", 1, 200))
+
+
+class CacheTest(unittest.TestCase):
+    def test_motor_type(self):
+        async def f():
+            dev = NewFocus8742Sim()
+            dev.use_cache = True
+            dev.set_velocity(1, 500)
+            dev.set_type(1, 3)
+            self.assertEqual(await dev.get_velocity(1), 500)
+            self.assertEqual(dev.settings[("QM", 1)], 3)
+            dev.set_relative(1, 10)
+            self.assertNotIn(("QM", 1), dev.settings)
+            # auto detection changed it
+            self.assertEqual(await dev.get_type(1), 2)
+        asyncio.run(f())
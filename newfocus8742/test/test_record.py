@@ -0,0 +1,38 @@
+import asyncio
+import unittest
+
+from newfocus8742.sim import NewFocus8742Sim
+from newfocus8742.controller import record
+
+
+class Sink:
+    def __init__(self):
+        self.samples = []
+
+    def append(self, timestamp, position, done):
+        self.samples.append((timestamp, list(position), list(done)))
+
+
+class RecordTest(unittest.TestCase):
+    def test_survives_errors(self):
+        async def f():
+            dev = NewFocus8742Sim()
+            calls = []
+            tp = dev.ask_tp
+
+            def ask_tp(xx):
+                calls.append(xx)
+                if len(calls) == 10:
+                    raise ValueError("lost")
+                return tp(xx)
+            dev.ask_tp = ask_tp
+            sinks = [Sink(), Sink()]
+            with self.assertLogs("newfocus8742.controller", "WARNING"):
+                task = asyncio.ensure_future(record(dev, sinks, rate=1000.))
+                await asyncio.sleep(.05)
+            self.assertFalse(task.done())
+            task.cancel()
+            return sinks
+        sinks = asyncio.run(f())
+        self.assertEqual(len(sinks[0].samples), 2)
+        self.assertEqual(sinks[0].samples, sinks[1].samples)
@@ -0,0 +1,119 @@
+import asyncio
+import unittest
+
+from newfocus8742.sim import NewFocus8742Sim
+from newfocus8742.tcp import NewFocus8742TCP
+
+
+class LateSim(NewFocus8742Sim):
+    """Simulation that delivers the responses to the first `late`
+    queries after `delay` and does not drain input on `flush()`."""
+    timeout = .05
+    quiet = .05
+    late = 0
+    delay = .1
+
+    def _execute(self, cmd):
+        n = len(self.pending)
+        super()._execute(cmd)
+        if self.late and len(self.pending) > n:
+            self.late -= 1
+            ret = self.pending.pop()
+            asyncio.get_event_loop().call_later(
+                self.delay, self.pending.append, ret)
+
+    def flush(self):
+        pass
+
+    async def _readline(self, timeout=None):
+        loop = asyncio.get_event_loop()
+        deadline = loop.time() + timeout
+        while not self.pending:
+            if loop.time() > deadline:
+                raise asyncio.TimeoutError()
+            await asyncio.sleep(.001)
+        return self.pending.pop(0)
+
+
+class ResyncTest(unittest.TestCase):
+    def check_late(self, delay):
+        async def f():
+            dev = LateSim()
+            dev.steps[0] = 17
+            dev.late = 1
+            dev.delay = delay
+            self.assertFalse(await dev.ping())
+            self.assertEqual(await dev.ask("TP?", 1), "17")
+            self.assertEqual(await dev.ask("AC?", 1), "100000")
+            return dev
+        dev = asyncio.run(f())
+        self.assertEqual(dev.stats["timeouts"], 1)
+        self.assertEqual(dev.stats["resyncs"], 1)
+        self.assertEqual(dev.stats["stale"], 1)
+
+    def test_late_before_sentinel(self):
+        # arrives while draining before the sentinel
+        self.check_late(.07)
+
+    def test_late_after_sentinel(self):
+        # arrives after the sentinel response, looks like it
+        self.check_late(.12)
+
+    def test_late_ping(self):
+        async def f():
+            dev = LateSim()
+            dev.late = 1
+            dev.delay = .2
+            with self.assertRaises(asyncio.TimeoutError):
+                await dev.ask("VE?", timeout=.1)
+            self.assertEqual(await dev.ask("TP?", 2), "0")
+        asyncio.run(f())
+
+    def test_concurrent_resync(self):
+        async def f():
+            dev = LateSim()
+            dev.steps[0] = 3
+            dev.late = 1
+            dev.delay = .02
+            ret = await asyncio.gather(dev.ask("TP?", 1), dev.resync())
+            self.assertEqual(ret[0], "3")
+            self.assertEqual(await dev.ask("AC?", 2), "100000")
+            return dev
+        dev = asyncio.run(f())
+        self.assertEqual(dev.stats["stale"], 0)
+
+
+class TCPDrainTest(unittest.TestCase):
+    def test_drain(self):
+        async def handle(reader, writer):
+            writer.write(b"garbg\x00")
+            while True:
+                try:
+                    line = await reader.readuntil(b"\r")
+                except asyncio.IncompleteReadError:
+                    break
+                if line == b"1TP?\r":
+                    # lost response, arrives late and in pieces
+                    await asyncio.sleep(.07)
+                    writer.write(b"5\r")
+                    await asyncio.sleep(.01)
+                    writer.write(b"\n")
+                elif line == b"VE?\r":
+                    writer.write(b"8742 v2.2 08/01/13\r\n")
+                elif line == b"2TP?\r":
+                    writer.write(b"7\r\n")
+
+        async def f():
+            server = await asyncio.start_server(handle, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            dev = await NewFocus8742TCP.connect("127.0.0.1", port)
+            dev.quiet = .05
+            with self.assertRaises(asyncio.TimeoutError):
+                await dev.ask("TP?", 1, timeout=.05)
+            self.assertEqual(await dev.ask("TP?", 2), "7")
+            dev.close()
+            server.close()
+            await server.wait_closed()
+            return dev
+        dev = asyncio.run(f())
+        self.assertEqual(dev.stats["stale"], 1)
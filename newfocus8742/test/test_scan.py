@@ -0,0 +1,34 @@
+import random
+import unittest
+
+from newfocus8742.scan import Planner, serpentine
+
+
+class PlannerTest(unittest.TestCase):
+    def setUp(self):
+        self.planner = Planner()
+
+    def test_grid(self):
+        points = [(i*100, j*100) for i in range(4) for j in range(3)]
+        random.shuffle(points)
+        path = self.planner.order(points)
+        self.assertEqual(path, serpentine(points))
+        self.assertEqual(path[:4], [(0, 0), (0, 100), (0, 200), (100, 200)])
+
+    def test_scattered(self):
+        random.seed(0)
+        points = [(random.randint(0, 3000), random.randint(0, 3000))
+                  for i in range(40)]
+        start = (0, 0)
+        nearest = self.planner.order(points, start=start)
+        self.assertEqual(nearest, self.planner.nearest(points, start))
+        tour = self.planner.order(points, "tour", start=start)
+        self.assertEqual(sorted(tour), sorted(points))
+        self.assertLessEqual(self.planner.estimate(tour, start),
+                             self.planner.estimate(nearest, start))
+
+    def test_small(self):
+        self.assertEqual(self.planner.tour([]), [])
+        self.assertEqual(self.planner.tour([(1, 2)]), [(1, 2)])
+        self.assertEqual(self.planner.tour([(1, 2)], start=(0, 0)),
+                         [(1, 2)])
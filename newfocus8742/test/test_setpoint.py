@@ -0,0 +1,72 @@
+import asyncio
+import unittest
+
+from newfocus8742.sim import NewFocus8742Sim
+
+
+class Sim(NewFocus8742Sim):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+        self.failures = 0
+
+    def _writeline(self, line):
+        if not line.endswith("?"):
+            self.lines.append(line)
+        super()._writeline(line)
+
+    def ask_md(self, xx):
+        return 1
+
+    async def finish(self, xx=None):
+        if self.failures:
+            self.failures -= 1
+            raise asyncio.TimeoutError()
+        await super().finish(xx)
+
+
+class SetpointTest(unittest.TestCase):
+    def run_async(self, f):
+        return asyncio.run(f())
+
+    def test_absolute(self):
+        async def f():
+            dev = Sim()
+            sp = dev.setpoint(1)
+            for i in range(5):
+                sp.put(i)
+            await asyncio.sleep(.05)
+            sp.close()
+            return dev, sp
+        dev, sp = self.run_async(f)
+        self.assertEqual(dev.lines, ["1PA4"])
+        self.assertEqual(sp.stats(), {"sent": 1, "coalesced": 4,
+                                      "errors": 0})
+
+    def test_retry(self):
+        async def f():
+            dev = Sim()
+            dev.poll_interval = .001
+            dev.failures = 2
+            sp = dev.setpoint(2, relative=True)
+            sp.put(3)
+            sp.put(4)
+            await asyncio.sleep(.05)
+            sp.close()
+            return dev, sp
+        dev, sp = self.run_async(f)
+        self.assertEqual(dev.lines, ["2PR7"])
+        self.assertEqual(sp.stats()["errors"], 2)
+
+    def test_jog(self):
+        async def f():
+            dev = Sim()
+            sp = dev.setpoint(3, jog=True)
+            for direction in (1, 5, -2, 0, -1):
+                sp.put(direction)
+                await asyncio.sleep(.02)
+            sp.close()
+            return dev
+        dev = self.run_async(f)
+        self.assertEqual(dev.lines, ["3MV+", "3ST", "3MV-", "3ST", "3MV-",
+                                     "3ST"])
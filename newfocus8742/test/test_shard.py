@@ -0,0 +1,41 @@
+import asyncio
+import unittest
+
+try:
+    from sipyco.pc_rpc import Server, AsyncioClient
+    from newfocus8742.shard import ShardPool, ShardProxy
+except ImportError:
+    Server = None
+
+from newfocus8742.sim import NewFocus8742Sim
+from newfocus8742.controller import Controller
+
+
+@unittest.skipIf(Server is None, "sipyco not available")
+class ShardTest(unittest.TestCase):
+    def test_front_end(self):
+        async def f():
+            dev = NewFocus8742Sim()
+            worker = Server({"newfocus8742": Controller(dev)},
+                            allow_parallel=True)
+            await worker.start("127.0.0.1", 43253)
+            pool = ShardPool("127.0.0.1", 43253, "newfocus8742")
+            proxy = ShardProxy(pool)
+            self.assertNotIn("close", dir(proxy))
+            front = Server({"newfocus8742_0": proxy}, allow_parallel=True)
+            await front.start("127.0.0.1", 43254)
+            client = AsyncioClient()
+            await client.connect_rpc("127.0.0.1", 43254, "newfocus8742_0")
+            try:
+                self.assertTrue(await client.ping())
+                await client.set_relative(2, 7)
+                ret = await asyncio.gather(*(client.position(2)
+                                             for i in range(8)))
+                self.assertEqual(ret, [7]*8)
+                self.assertEqual(await client.ask("TP?", 2), "7")
+            finally:
+                client.close_rpc()
+                pool.close()
+                await front.stop()
+                await worker.stop()
+        asyncio.run(f())
@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+
+try:
+    import numpy as np
+    from newfocus8742.shm import RingWriter, RingReader
+except ImportError:
+    np = None
+
+
+@unittest.skipIf(np is None, "numpy not available")
+class RingTest(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        os.close(fd)
+
+    def tearDown(self):
+        os.unlink(self.path)
+
+    def test_empty(self):
+        w = RingWriter(self.path, size=8)
+        r = RingReader(self.path)
+        self.assertEqual(r.seq, 0)
+        self.assertIsNone(r.latest())
+        start, end, views = r.read()
+        self.assertEqual((start, end), (0, 0))
+        self.assertEqual(sum(len(v) for v in views), 0)
+        w.close()
+
+    def test_round_trip(self):
+        w = RingWriter(self.path, size=8, axes=2)
+        for i in range(3):
+            w.append(float(i), [i, -i], [True, False])
+        r = RingReader(self.path)
+        start, end, views = r.read()
+        self.assertEqual((start, end), (0, 3))
+        data = np.concatenate(views)
+        np.testing.assert_equal(data["time"], [0., 1., 2.])
+        np.testing.assert_equal(data["position"], [[0, 0], [1, -1], [2, -2]])
+        np.testing.assert_equal(data["done"], [[1, 0]]*3)
+        self.assertTrue(r.valid(start))
+        w.close()
+
+    def test_wrap(self):
+        w = RingWriter(self.path, size=8)
+        r = RingReader(self.path)
+        for i in range(10):
+            w.append(float(i), [i]*4, [False]*4)
+        start, end, views = r.read()
+        self.assertEqual((start, end), (3, 10))
+        self.assertEqual(len(views), 2)
+        data = np.concatenate(views)
+        np.testing.assert_equal(data["time"], np.arange(3., 10.))
+        self.assertEqual(r.latest()["position"][0], 9)
+        self.assertFalse(r.valid(0))
+        start, end, views = r.read(8)
+        np.testing.assert_equal(np.concatenate(views)["time"], [8., 9.])
+        w.close()
@@ -0,0 +1,41 @@
+import asyncio
+import unittest
+
+from newfocus8742.stream import StreamServer, FRAME
+
+try:
+    import numpy as np
+    from newfocus8742.stream import StreamClient
+except ImportError:
+    np = None
+
+
+@unittest.skipIf(np is None, "numpy not available")
+class StreamTest(unittest.TestCase):
+    def test_publish(self):
+        async def f():
+            server = StreamServer(interval=.001)
+            await server.start("127.0.0.1", 0)
+            port = server._server.sockets[0].getsockname()[1]
+            client = StreamClient()
+            await client.connect("127.0.0.1", port)
+            while not server.clients:
+                await asyncio.sleep(.001)
+            sink = server.sink(2)
+            sink.append(1.5, [1, -2, 3, 4], [True, False, False, True])
+            sink.append(2.5, [5, 6, 7, 8], [False]*4)
+            frames = await asyncio.wait_for(client.read(), 1)
+            server.publish(3.5, 1, [0]*4, [True]*4)
+            await asyncio.wait_for(server.stop(), 1)
+            rest = [f async for f in client]
+            client.close()
+            return frames, rest
+        frames, rest = asyncio.run(f())
+        self.assertEqual(frames.dtype.itemsize, FRAME.size)
+        np.testing.assert_equal(frames["time"], [1.5, 2.5])
+        np.testing.assert_equal(frames["controller"], [2, 2])
+        np.testing.assert_equal(frames["position"],
+                                [[1, -2, 3, 4], [5, 6, 7, 8]])
+        np.testing.assert_equal(frames["done"], [0b1001, 0])
+        # the pending batch is discarded on stop
+        self.assertEqual(rest, [])
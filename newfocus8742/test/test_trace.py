@@ -0,0 +1,43 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+from newfocus8742.trace import SpanExporter, RingTrace
+from newfocus8742.test.test_resync import LateSim
+
+
+class SpanTest(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        os.close(fd)
+
+    def tearDown(self):
+        os.unlink(self.path)
+
+    def test_lost(self):
+        async def f():
+            spans = SpanExporter(self.path)
+            dev = LateSim()
+            ring = RingTrace()
+            dev.trace_hooks[:] = [spans.hook(3), ring]
+            dev.late = 1
+            dev.delay = .5
+            with self.assertRaises(asyncio.TimeoutError):
+                await dev.ask("TP?", 1)
+            self.assertEqual(await dev.ask("TP?", 1), "0")
+            spans.close()
+            return ring
+        ring = asyncio.run(f())
+        with open(self.path) as f:
+            spans = [json.loads(line) for line in f]
+        queries = [(s["attributes"]["line"], s["attributes"].get("dropped"),
+                    s["end_time_unix_nano"] - s["start_time_unix_nano"])
+                   for s in spans if s["name"] == "query"]
+        self.assertEqual([q[:2] for q in queries],
+                         [("1TP?", True), ("VE?", None), ("1TP?", None)])
+        self.assertLess(queries[-1][2], .02e9)
+        self.assertTrue(all(s["attributes"]["controller"] == 3
+                            for s in spans))
+        self.assertIn("dropped", [e[1] for e in ring.events])
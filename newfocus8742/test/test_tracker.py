@@ -0,0 +1,87 @@
+import asyncio
+import math
+import unittest
+
+from newfocus8742.sim import NewFocus8742Sim
+from newfocus8742.tracker import travel, Tracker
+
+
+class TravelTest(unittest.TestCase):
+    def test_trapezoid(self):
+        v, a = 1000., 10000.
+        d = 1000.
+        # .1 s ramps, .9 s cruise
+        self.assertEqual(travel(0., d, v, a), 0.)
+        self.assertAlmostEqual(travel(.1, d, v, a), 50.)
+        self.assertAlmostEqual(travel(.5, d, v, a), 450.)
+        self.assertAlmostEqual(travel(1., d, v, a), 950.)
+        self.assertAlmostEqual(travel(1.05, d, v, a), 987.5)
+        self.assertEqual(travel(1.1, d, v, a), d)
+        self.assertEqual(travel(10., d, v, a), d)
+
+    def test_triangle(self):
+        v, a = 1000., 10000.
+        d = 10.
+        self.assertAlmostEqual(travel(math.sqrt(d/a), d, v, a), d/2)
+        self.assertEqual(travel(1., d, v, a), d)
+
+    def test_zero(self):
+        self.assertEqual(travel(0., 0., 1000., 10000.), 0.)
+        self.assertEqual(travel(1., 0., 1000., 10000.), 0.)
+
+    def test_indefinite(self):
+        self.assertAlmostEqual(travel(1.1, math.inf, 1000., 10000.), 1050.)
+
+
+class TrackerTest(unittest.TestCase):
+    def setUp(self):
+        self.dev = NewFocus8742Sim()
+        self.tracker = Tracker(self.dev)
+        self.dev.tracker = self.tracker
+        self.dev.observers.append(self.tracker)
+
+    def test_zero_move(self):
+        self.dev.set_relative(1, 0)
+        self.dev.set_position(2, 0)
+        self.assertFalse(self.tracker.moving(1))
+        self.assertEqual(self.tracker.estimate(1)[0], 0)
+        self.assertEqual(self.tracker.estimate(2)[0], 0)
+        self.dev.set_relative(1, 10)
+        self.assertTrue(self.tracker.moving(1))
+
+    def test_move(self):
+        self.dev.set_relative(1, -10)
+        self.assertTrue(self.tracker.moving(1))
+        self.tracker.axes[1].t0 -= 1.
+        self.assertFalse(self.tracker.moving(1))
+        self.assertEqual(self.tracker.estimate(1)[0], -10)
+        # stop after the move ended
+        self.dev.stop(1)
+        self.assertEqual(self.tracker.estimate(1)[0], -10)
+
+    def test_stop(self):
+        self.dev.move(3, "-")
+        ax = self.tracker.axes[3]
+        ax.t0 -= 1.
+        self.dev.stop(3)
+        self.assertTrue(self.tracker.moving(3))
+        ax.t0 -= 1.
+        self.assertFalse(self.tracker.moving(3))
+        # the ramps add up to one second at full speed
+        self.assertAlmostEqual(self.tracker.estimate(3)[0], -ax.v, delta=2)
+
+    def test_sync(self):
+        self.dev.steps[1] = 7
+        error = asyncio.run(self.tracker.sync())
+        self.assertEqual(error, {1: 0, 2: 7, 3: 0, 4: 0})
+        self.assertEqual(self.tracker.estimate(2)[0], 7)
+
+    def test_run_survives_errors(self):
+        async def f():
+            self.dev.timeout = .01
+            self.dev.ask_tp = lambda xx: None  # raises in the simulation
+            task = asyncio.ensure_future(self.tracker.run(.01))
+            await asyncio.sleep(.05)
+            self.assertFalse(task.done())
+            task.cancel()
+        asyncio.run(f())
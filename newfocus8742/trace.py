@@ -0,0 +1,157 @@
+"""Trace hooks for the driver's hot path.
+
+Hooks are registered by appending them to
+:attr:`NewFocus8742Protocol.trace_hooks`. Without hooks, tracing costs
+one list check per line sent or response received. All timestamps are
+`time.monotonic()`.
+"""
+
+import collections
+import itertools
+import json
+import os
+import sys
+import time
+
+
+class TraceHook:
+    """Trace hook base class. Override the events of interest."""
+    def pre_send(self, t, line):
+        """Called before a line is written to the device."""
+        pass
+
+    def post_send(self, t, line):
+        """Called after a line has been written to the device."""
+        pass
+
+    def response(self, t, line, ret):
+        """Called when the response `ret` to the query `line` has been
+        read."""
+        pass
+
+    def dropped(self, t, line):
+        """Called when the response to the query `line` has been lost
+        and the query failed, see :meth:`NewFocus8742Protocol.resync`."""
+        pass
+
+
+class LogTrace(TraceHook):
+    """Log lines sent and responses at debug level.
+
+    Args:
+        logger (logging.Logger): Logger.
+    """
+    def __init__(self, logger):
+        self.logger = logger
+
+    def pre_send(self, t, line):
+        self.logger.debug("do %s", line)
+
+    def response(self, t, line, ret):
+        self.logger.debug("ret %s", ret)
+
+    def dropped(self, t, line):
+        self.logger.debug("dropped %s", line)
+
+
+class RingTrace(TraceHook):
+    """Keep the most recent events in memory.
+
+    Args:
+        maxlen (int): Number of events kept.
+    """
+    def __init__(self, maxlen=1024):
+        self.events = collections.deque(maxlen=maxlen)
+
+    def pre_send(self, t, line):
+        self.events.append((t, "pre_send", line, None))
+
+    def post_send(self, t, line):
+        self.events.append((t, "post_send", line, None))
+
+    def response(self, t, line, ret):
+        self.events.append((t, "response", line, ret))
+
+    def dropped(self, t, line):
+        self.events.append((t, "dropped", line, None))
+
+    def dump(self, file=sys.stdout):
+        """Print the events kept."""
+        for t, event, line, ret in self.events:
+            print("{:.6f} {} {!r}{}".format(
+                t, event, line, "" if ret is None else " -> {!r}".format(ret)),
+                file=file)
+
+
+class SpanExporter:
+    """Export spans in an OpenTelemetry-like JSON lines format to a file.
+
+    Each line sent is a span from `pre_send` to `post_send`, each query is
+    a span from `pre_send` to the response. Spans of several controllers
+    can share one file, register one :meth:`hook` per controller.
+
+    Args:
+        path (str): Output file, appended to.
+        name (str): Service name attribute.
+    """
+    def __init__(self, path, name="newfocus8742"):
+        self.file = open(path, "a")
+        self.name = name
+        self.trace_id = os.urandom(16).hex()
+        self._ids = itertools.count(1)
+        # offset from monotonic to unix time
+        self._offset = time.time() - time.monotonic()
+
+    def hook(self, controller=0):
+        """Get a trace hook exporting the spans of a controller.
+
+        Args:
+            controller (int): Controller index attribute.
+        """
+        return _SpanHook(self, controller)
+
+    def _export(self, name, kind, start, end, **attributes):
+        span = {
+            "trace_id": self.trace_id,
+            "span_id": "{:016x}".format(next(self._ids)),
+            "name": name,
+            "kind": kind,
+            "start_time_unix_nano": int((start + self._offset)*1e9),
+            "end_time_unix_nano": int((end + self._offset)*1e9),
+            "attributes": dict(attributes, **{"service.name": self.name}),
+        }
+        self.file.write(json.dumps(span) + "\n")
+
+    def close(self):
+        self.file.close()
+
+
+class _SpanHook(TraceHook):
+    # queries in flight are per controller
+    def __init__(self, exporter, controller):
+        self.exporter = exporter
+        self.controller = controller
+        self._sent = {}
+        self._queries = collections.defaultdict(collections.deque)
+
+    def pre_send(self, t, line):
+        self._sent[line] = t
+
+    def post_send(self, t, line):
+        start = self._sent.pop(line, t)
+        self.exporter._export("send", "write", start, t, line=line,
+                              controller=self.controller)
+        if line.endswith("?"):
+            self._queries[line].append(start)
+
+    def response(self, t, line, ret):
+        q = self._queries.get(line)
+        start = q.popleft() if q else t
+        self.exporter._export("query", "query", start, t, line=line,
+                              response=ret, controller=self.controller)
+
+    def dropped(self, t, line):
+        q = self._queries.get(line)
+        start = q.popleft() if q else t
+        self.exporter._export("query", "query", start, t, line=line,
+                              dropped=True, controller=self.controller)
@@ -0,0 +1,190 @@
+"""Dead-reckoning position tracker.
+
+Predicts the actual position of each axis from the commands sent to the
+controller and the velocity and acceleration settings, assuming a
+trapezoidal velocity profile.
+"""
+
+import logging
+import asyncio
+import math
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def travel(t, d, v, a):
+    """Distance travelled after time `t` on a move of length `d`.
+
+    Args:
+        t (float): Time since the start of the move in seconds.
+        d (float): Move length in steps (may be `inf`).
+        v (float): Velocity in steps/s.
+        a (float): Acceleration in steps/s².
+    """
+    if not d:
+        return 0.
+    ta = v/a
+    da = v*ta/2
+    if 2*da > d:  # triangular profile
+        ta = math.sqrt(d/a)
+        v = a*ta
+        da = d/2
+    tc = (d - 2*da)/v
+    if t < ta:
+        return a*t**2/2
+    if t < ta + tc:
+        return da + v*(t - ta)
+    t = ta + tc + ta - t
+    if t > 0:
+        return d - a*t**2/2
+    return d
+
+
+class _Axis:
+    def __init__(self, now):
+        self.p0 = 0
+        self.t0 = now
+        self.direction = 0  # 0 if not moving
+        self.distance = 0.
+        self.v = 2000.
+        self.a = 100000.
+        self.synced = None  # time of last verification, None if unknown
+
+    def predict(self, now):
+        if not self.direction:
+            return self.p0
+        d = travel(now - self.t0, self.distance, self.v, self.a)
+        if d >= self.distance:
+            self.p0 += self.direction*self.distance
+            self.direction = 0
+            return self.p0
+        return self.p0 + self.direction*d
+
+    def speed(self, now):
+        dt = 1e-3
+        return abs(self.predict(now + dt) - self.predict(now))/dt
+
+
+class Tracker:
+    """Dead-reckoning position tracker.
+
+    The tracker is fed the commands sent by the driver and predicts the
+    positions without any I/O. :meth:`run` periodically verifies the
+    prediction against the actual position (TP?).
+
+    Args:
+        dev (NewFocus8742Protocol): Driver instance.
+        axes (list(int)): Axes to track.
+    """
+    def __init__(self, dev, axes=(1, 2, 3, 4)):
+        self.dev = dev
+        now = time.monotonic()
+        self.axes = {xx: _Axis(now) for xx in axes}
+
+    def moving(self, xx):
+        """Whether the axis is predicted to be moving."""
+        ax = self.axes[xx]
+        ax.predict(time.monotonic())
+        return bool(ax.direction)
+
+    def estimate(self, xx):
+        """Get the predicted actual position of an axis.
+
+        Returns:
+            tuple: `(position, age)` where `age` is the time in seconds
+                since the prediction was last verified (`inf` if never).
+        """
+        ax = self.axes[xx]
+        now = time.monotonic()
+        p = round(ax.predict(now))
+        age = math.inf if ax.synced is None else now - ax.synced
+        return p, age
+
+    def _start(self, ax, now, distance, direction):
+        ax.p0 = ax.predict(now)
+        ax.t0 = now
+        ax.distance = distance
+        ax.direction = direction if distance else 0  # no move
+
+    def issued(self, cmd, xx=None, *nn):
+        """Update the prediction with a command sent to the controller."""
+        now = time.monotonic()
+        if cmd in ("*RST", "*RCL"):
+            for ax in self.axes.values():
+                ax.synced = None
+            return
+        if cmd == "AB":
+            for ax in self.axes.values():
+                ax.p0 = ax.predict(now)
+                ax.direction = 0
+            return
+        ax = self.axes.get(xx)
+        if ax is None:
+            if cmd == "ST" and xx is None:
+                for xx in self.axes:
+                    self.issued(cmd, xx)
+            return
+        ax.predict(now)
+        if cmd in ("PR", "PA", "MV"):
+            if ax.direction:
+                return  # ignored by the controller: MOTION IN PROGRESS
+            ax.v = self.dev.settings.get(("VA", xx), ax.v)
+            ax.a = self.dev.settings.get(("AC", xx), ax.a)
+            if cmd == "MV":
+                n = nn[0] if nn else 1
+                n = {"+": 1, "-": -1}.get(n, n)
+                self._start(ax, now, math.inf, 1 if n >= 0 else -1)
+                return
+            n = nn[0] if nn else 0
+            if cmd == "PA":
+                n -= ax.predict(now)
+            self._start(ax, now, abs(n), 1 if n >= 0 else -1)
+        elif cmd == "ST":
+            if ax.direction:
+                # stop with deceleration
+                v = ax.speed(now)
+                self._start(ax, now, v**2/(2*ax.a), ax.direction)
+        elif cmd == "DH":
+            ax.p0 = nn[0] if nn else 0
+            ax.t0 = now
+            ax.direction = 0
+
+    async def sync(self):
+        """Verify the predictions against the actual positions.
+
+        All axes are queried in one pipelined exchange. The predictions
+        of axes that are not moving are replaced by the actual positions.
+
+        Returns:
+            dict: Prediction error by axis.
+        """
+        axes = list(self.axes)
+        ret = await self.dev.ask_many(("TP?", xx) for xx in axes)
+        now = time.monotonic()
+        error = {}
+        for xx, r in zip(axes, ret):
+            ax = self.axes[xx]
+            p = ax.predict(now)
+            error[xx] = int(r) - round(p)
+            if not ax.direction:
+                ax.p0 = int(r)
+                ax.synced = now
+        logger.debug("tracking error %s", error)
+        return error
+
+    async def run(self, interval=1.):
+        """Periodically verify the predictions, see :meth:`sync`.
+
+        Args:
+            interval (float): Verification interval in seconds.
+        """
+        while True:
+            try:
+                await self.sync()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("position verification failed",
+                               exc_info=True)
+            await asyncio.sleep(interval)
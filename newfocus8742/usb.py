@@ -1,5 +1,4 @@
-import usb.core
-import usb.util
+import asyncio
 
 from .protocol import NewFocus8742Protocol
 
@@ -9,6 +8,13 @@ class NewFocus8742USB(NewFocus8742Protocol):
     eol_read = b"\r\n"
 
     def __init__(self, dev):
+        # pyusb is imported here rather than at module level to keep
+        # startup fast, and kept off the hot path
+        import usb.core
+        import usb.util
+        self._usb_core = usb.core
+        self._usb_util = usb.util
+        super().__init__()
         self.dev = dev
         # dev.set_configuration()  # breaks the second invocation
         cfg = dev.get_active_configuration()
@@ -37,6 +43,7 @@ class NewFocus8742USB(NewFocus8742Protocol):
         Returns:
             NewFocus8742: Driver instance.
         """
+        import usb.core
         dev = usb.core.find(idProduct=idProduct, idVendor=idVendor,
                 **kwargs)
         if dev is None:
@@ -48,11 +55,11 @@ class NewFocus8742USB(NewFocus8742Protocol):
         while True:
             try:
                 self.ep_in.read(64, timeout=10)
-            except usb.core.USBError:
+            except self._usb_core.USBError:
                 break
 
     def close(self):
-        usb.util.dispose_resources(self.dev)
+        self._usb_util.dispose_resources(self.dev)
 
     def __enter__(self):
         return self
@@ -63,9 +70,14 @@ class NewFocus8742USB(NewFocus8742Protocol):
     def _writeline(self, cmd):
         self.ep_out.write(cmd.encode() + self.eol_write)
 
-    async def _readline(self):
+    async def _readline(self, timeout=None):
         # This is obviously not asynchronous
-        r = self.ep_in.read(64).tobytes()
+        if timeout is not None:
+            timeout = max(1, int(timeout*1000))
+        try:
+            r = self.ep_in.read(64, timeout=timeout).tobytes()
+        except self._usb_core.USBTimeoutError:
+            raise asyncio.TimeoutError()
         assert r.endswith(self.eol_read)
         r = r[:-2].decode()
         return r
@@ -15,7 +15,9 @@ setup(
     url="https://github.com/quartiq/newfocus8742",
     download_url="https://github.com/quartiq/newfocus8742",
     packages=find_packages(),
+    python_requires=">=3.6",
     install_requires=["sipyco"],
+    extras_require={"shm": ["numpy"]},
     entry_points={
         "console_scripts": [
             "aqctl_newfocus8742 = newfocus8742.aqctl_newfocus8742:main",